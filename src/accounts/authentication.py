@@ -1,18 +1,29 @@
+from django.core.exceptions import ValidationError
+
 from accounts.models import Token, User
+from accounts.user_cache import get_user_cache
 
 
 class PasswordlessAuthenticationBackend:
     def authenticate(self, request, uid):
         try:
-            token = Token.objects.get(uid=uid)
-            return User.objects.get(email=token.email)
-        except User.DoesNotExist:
-            return User.objects.create(email=token.email)
-        except Token.DoesNotExist:
+            token = Token.objects.unexpired().get(uid=uid)
+        except (Token.DoesNotExist, ValidationError):
+            return None
+        # Tokens are single use: only the request that deletes it logs in.
+        deleted, _ = Token.objects.filter(pk=token.pk).delete()
+        if not deleted:
             return None
+        user, _ = User.objects.get_or_create(email=token.email)
+        return user
 
     def get_user(self, email):
+        cache = get_user_cache()
+        if (user := cache.get(email)) is not None:
+            return user
         try:
-            return User.objects.get(email=email)
+            user = User.objects.get(email=email)
         except User.DoesNotExist:
             return None
+        cache.set(email, user)
+        return user
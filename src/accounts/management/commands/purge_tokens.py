@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from accounts.models import Token
+
+
+class Command(BaseCommand):
+    help = "Delete expired login tokens in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_tokens(options["batch_size"])
+        self.stdout.write(f"Deleted {deleted} expired tokens")
+
+
+def purge_expired_tokens(batch_size=1000):
+    total = 0
+    while True:
+        ids = list(Token.objects.expired().values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return total
+        deleted, _ = Token.objects.filter(id__in=ids).delete()
+        total += deleted
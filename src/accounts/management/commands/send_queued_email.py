@@ -0,0 +1,27 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from accounts.outbox import send_queued_emails
+
+
+class Command(BaseCommand):
+    help = "Send queued login emails over a single mail connection per batch run."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the outbox instead of exiting once it is empty.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent = send_queued_emails(options["batch_size"])
+            if sent or not options["loop"]:
+                self.stdout.write(f"Sent {sent} emails")
+            if not options["loop"]:
+                return
+            time.sleep(settings.EMAIL_OUTBOX_POLL_SECONDS)
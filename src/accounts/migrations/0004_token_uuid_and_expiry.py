@@ -0,0 +1,32 @@
+# Generated by Django 5.1.1 on 2026-10-17 10:05
+
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+def delete_outstanding_tokens(apps, schema_editor):
+    # Old uids were stored as dashed strings, which a UUIDField cannot look
+    # up. Login links only live for minutes, so just drop them.
+    apps.get_model("accounts", "Token").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_alter_token_uid'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_outstanding_tokens, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='token',
+            name='uid',
+            field=models.UUIDField(default=uuid.uuid4, unique=True),
+        ),
+        migrations.AddField(
+            model_name='token',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.1 on 2026-10-17 15:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_token_uuid_and_expiry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboundEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=255)),
+                ('body', models.TextField()),
+                ('from_email', models.CharField(max_length=254)),
+                ('to', models.EmailField(max_length=254)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('claim', models.UUIDField(db_index=True, null=True)),
+                ('claimed_at', models.DateTimeField(null=True)),
+            ],
+        ),
+    ]
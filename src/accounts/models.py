@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 import uuid
 
 
@@ -10,6 +12,31 @@ class User(models.Model):
     is_anonymous = False
     is_authenticated = True
 
+
+class TokenQuerySet(models.QuerySet):
+    def expiry_cutoff(self):
+        return timezone.now() - settings.LOGIN_TOKEN_TTL
+
+    def unexpired(self):
+        return self.filter(created_at__gte=self.expiry_cutoff())
+
+    def expired(self):
+        return self.filter(created_at__lt=self.expiry_cutoff())
+
+
 class Token(models.Model):
     email = models.EmailField()
-    uid = models.CharField(default=uuid.uuid4, max_length=40)
+    uid = models.UUIDField(default=uuid.uuid4, unique=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = TokenQuerySet.as_manager()
+
+
+class OutboundEmail(models.Model):
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.EmailField()
+    created_at = models.DateTimeField(default=timezone.now)
+    claim = models.UUIDField(null=True, db_index=True)
+    claimed_at = models.DateTimeField(null=True)
@@ -0,0 +1,80 @@
+import logging
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection as db_connection
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+def queue_email(subject, body, from_email, to):
+    return OutboundEmail.objects.create(
+        subject=subject, body=body, from_email=from_email, to=to
+    )
+
+
+def claim_batch(batch_size):
+    # Claiming with a single UPDATE lets several workers drain the outbox
+    # without sending anything twice. Claims that were never released (a
+    # worker died mid-send) become available again after the lease.
+    now = timezone.now()
+    claim = uuid.uuid4()
+    available = OutboundEmail.objects.filter(
+        Q(claim__isnull=True) | Q(claimed_at__lt=now - settings.EMAIL_OUTBOX_LEASE)
+    ).order_by("id")
+    OutboundEmail.objects.filter(
+        id__in=available.values("id")[:batch_size]
+    ).update(claim=claim, claimed_at=now)
+    return list(OutboundEmail.objects.filter(claim=claim).order_by("id"))
+
+
+def send_queued_emails(batch_size=None, connection=None):
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    sent = 0
+    with connection or get_connection() as mail_connection:
+        while batch := claim_batch(batch_size):
+            mail_connection.send_messages(
+                [
+                    EmailMessage(email.subject, email.body, email.from_email, [email.to])
+                    for email in batch
+                ]
+            )
+            OutboundEmail.objects.filter(id__in=[email.id for email in batch]).delete()
+            sent += len(batch)
+    return sent
+
+
+class OutboxWorker(threading.Thread):
+    def __init__(self):
+        super().__init__(name="email-outbox", daemon=True)
+        self.wakeup = threading.Event()
+
+    def run(self):
+        while True:
+            self.wakeup.wait(timeout=settings.EMAIL_OUTBOX_POLL_SECONDS)
+            self.wakeup.clear()
+            try:
+                send_queued_emails()
+            except Exception:
+                logger.exception("Failed to drain the email outbox")
+            finally:
+                db_connection.close()
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def wake_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = OutboxWorker()
+            _worker.start()
+    _worker.wakeup.set()
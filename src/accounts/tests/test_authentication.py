@@ -1,9 +1,14 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.http import HttpRequest
 from django.test import TestCase
+from django.utils import timezone
 
 from accounts.authentication import PasswordlessAuthenticationBackend
 from accounts.models import Token
+from accounts.user_cache import get_user_cache
 
 User = get_user_model()
 
@@ -33,8 +38,35 @@ class AuthenticateTest(TestCase):
         )
         self.assertEqual(user, existing_user)
 
+    def test_returns_None_if_token_expired(self):
+        token = Token.objects.create(
+            email="edith@example.com",
+            created_at=timezone.now() - settings.LOGIN_TOKEN_TTL - timedelta(seconds=1),
+        )
+        result = PasswordlessAuthenticationBackend().authenticate(
+            HttpRequest(), token.uid
+        )
+        self.assertIsNone(result)
+
+    def test_token_can_only_be_used_once(self):
+        token = Token.objects.create(email="edith@example.com")
+        backend = PasswordlessAuthenticationBackend()
+        self.assertIsNotNone(backend.authenticate(HttpRequest(), token.uid))
+        self.assertIsNone(backend.authenticate(HttpRequest(), token.uid))
+        self.assertFalse(Token.objects.exists())
+
+    def test_accepts_uid_as_string(self):
+        token = Token.objects.create(email="edith@example.com")
+        user = PasswordlessAuthenticationBackend().authenticate(
+            HttpRequest(), str(token.uid)
+        )
+        self.assertEqual(user.email, "edith@example.com")
+
 
 class GetUserTest(TestCase):
+    def setUp(self):
+        get_user_cache().clear()
+
     def test_gets_user_by_email(self):
         User.objects.create(email="another@example.com")
         desired_user = User.objects.create(email="edith@example.com")
@@ -45,3 +77,28 @@ class GetUserTest(TestCase):
         self.assertIsNone(
             PasswordlessAuthenticationBackend().get_user("edith@example.com")
         )
+
+    def test_second_lookup_is_served_from_cache(self):
+        User.objects.create(email="edith@example.com")
+        backend = PasswordlessAuthenticationBackend()
+        backend.get_user("edith@example.com")
+        with self.assertNumQueries(0):
+            user = backend.get_user("edith@example.com")
+        self.assertEqual(user.email, "edith@example.com")
+        self.assertEqual(get_user_cache().stats()["hits"], 1)
+        self.assertEqual(get_user_cache().stats()["misses"], 1)
+
+    def test_deleting_user_invalidates_cache(self):
+        user = User.objects.create(email="edith@example.com")
+        backend = PasswordlessAuthenticationBackend()
+        backend.get_user("edith@example.com")
+        user.delete()
+        self.assertIsNone(backend.get_user("edith@example.com"))
+
+    def test_authenticated_requests_skip_the_user_query(self):
+        user = User.objects.create(email="edith@example.com")
+        self.client.force_login(user)
+        self.client.get("/")
+        with self.assertNumQueries(1):  # just the session
+            response = self.client.get("/")
+        self.assertContains(response, "Logged in as edith@example.com")
@@ -1,5 +1,10 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db.utils import IntegrityError
 from django.test import TestCase
+from django.utils import timezone
 from accounts.models import Token
 
 User = get_user_model()
@@ -19,3 +24,17 @@ class TokenModelTest(TestCase):
         token1 = Token.objects.create(email="a@b.com")
         token2 = Token.objects.create(email="a@b.com")
         self.assertNotEqual(token1.uid, token2.uid)
+
+    def test_uid_is_unique(self):
+        token = Token.objects.create(email="a@b.com")
+        with self.assertRaises(IntegrityError):
+            Token.objects.create(email="c@d.com", uid=token.uid)
+
+    def test_expired_and_unexpired_split_on_ttl(self):
+        fresh = Token.objects.create(email="a@b.com")
+        stale = Token.objects.create(
+            email="a@b.com",
+            created_at=timezone.now() - settings.LOGIN_TOKEN_TTL - timedelta(seconds=1),
+        )
+        self.assertEqual(list(Token.objects.unexpired()), [fresh])
+        self.assertEqual(list(Token.objects.expired()), [stale])
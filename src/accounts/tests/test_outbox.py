@@ -0,0 +1,66 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import OutboundEmail
+from accounts.outbox import claim_batch, queue_email, send_queued_emails
+
+
+def queue(count):
+    for i in range(count):
+        queue_email("Subject", f"Body {i}", "noreply@superlists", f"user{i}@example.com")
+
+
+class SendQueuedEmailsTest(TestCase):
+    def test_sends_all_queued_emails_and_empties_outbox(self):
+        queue(5)
+        self.assertEqual(send_queued_emails(batch_size=2), 5)
+        self.assertEqual(
+            [email.to for email in mail.outbox],
+            [[f"user{i}@example.com"] for i in range(5)],
+        )
+        self.assertFalse(OutboundEmail.objects.exists())
+
+    def test_reuses_one_mail_connection_for_all_batches(self):
+        queue(5)
+        with mock.patch(
+            "accounts.outbox.get_connection", wraps=mail.get_connection
+        ) as mock_get_connection:
+            send_queued_emails(batch_size=2)
+        self.assertEqual(mock_get_connection.call_count, 1)
+
+    def test_does_not_resend_emails_claimed_by_another_worker(self):
+        queue(3)
+        claim_batch(2)
+        self.assertEqual(send_queued_emails(), 1)
+        self.assertEqual(OutboundEmail.objects.count(), 2)
+
+    def test_reclaims_emails_after_the_lease_expires(self):
+        queue(1)
+        claim_batch(1)
+        OutboundEmail.objects.update(
+            claimed_at=timezone.now() - settings.EMAIL_OUTBOX_LEASE - timedelta(seconds=1)
+        )
+        self.assertEqual(send_queued_emails(), 1)
+
+    def test_failed_send_leaves_emails_queued(self):
+        queue(1)
+        connection = mock.MagicMock()
+        connection.__enter__.return_value = connection
+        connection.send_messages.side_effect = OSError("SMTP down")
+        with self.assertRaises(OSError):
+            send_queued_emails(connection=connection)
+        self.assertEqual(OutboundEmail.objects.count(), 1)
+
+    def test_management_command_drains_outbox(self):
+        queue(2)
+        out = StringIO()
+        call_command("send_queued_email", stdout=out)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertIn("Sent 2 emails", out.getvalue())
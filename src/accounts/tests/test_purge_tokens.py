@@ -0,0 +1,24 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import Token
+
+
+class PurgeTokensTest(TestCase):
+    def test_deletes_only_expired_tokens_in_batches(self):
+        stale = timezone.now() - settings.LOGIN_TOKEN_TTL - timedelta(minutes=1)
+        Token.objects.bulk_create(
+            Token(email=f"user{i}@example.com", created_at=stale) for i in range(7)
+        )
+        fresh = Token.objects.create(email="edith@example.com")
+        out = StringIO()
+
+        call_command("purge_tokens", batch_size=3, stdout=out)
+
+        self.assertEqual(list(Token.objects.all()), [fresh])
+        self.assertIn("Deleted 7 expired tokens", out.getvalue())
@@ -0,0 +1,52 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from accounts.models import User
+from accounts.user_cache import UserCache, get_user_cache
+
+
+class UserCacheTest(SimpleTestCase):
+    def test_evicts_least_recently_used_entry(self):
+        cache = UserCache(maxsize=2, ttl=60)
+        cache.set("a@b.com", User(email="a@b.com"))
+        cache.set("c@d.com", User(email="c@d.com"))
+        cache.get("a@b.com")
+        cache.set("e@f.com", User(email="e@f.com"))
+        self.assertIsNotNone(cache.get("a@b.com"))
+        self.assertIsNone(cache.get("c@d.com"))
+        self.assertEqual(cache.stats()["size"], 2)
+
+    def test_entries_expire_after_ttl(self):
+        cache = UserCache(maxsize=10, ttl=60)
+        with mock.patch("accounts.user_cache.time.monotonic", return_value=1000):
+            cache.set("a@b.com", User(email="a@b.com"))
+        with mock.patch("accounts.user_cache.time.monotonic", return_value=1061):
+            self.assertIsNone(cache.get("a@b.com"))
+
+    def test_counts_hits_and_misses(self):
+        cache = UserCache(maxsize=10, ttl=60)
+        cache.get("a@b.com")
+        cache.set("a@b.com", User(email="a@b.com"))
+        cache.get("a@b.com")
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_zero_size_disables_local_entries(self):
+        cache = UserCache(maxsize=0, ttl=60)
+        cache.set("a@b.com", User(email="a@b.com"))
+        self.assertIsNone(cache.get("a@b.com"))
+
+    @override_settings(AUTH_USER_CACHE_SIZE=0, AUTH_USER_CACHE_ALIAS="default")
+    def test_falls_back_to_shared_django_cache(self):
+        cache = get_user_cache()
+        cache.set("a@b.com", User(email="a@b.com"))
+        self.assertEqual(cache.get("a@b.com").email, "a@b.com")
+        cache.invalidate("a@b.com")
+        self.assertIsNone(cache.get("a@b.com"))
+
+    def test_settings_changes_rebuild_the_cache(self):
+        before = get_user_cache()
+        with override_settings(AUTH_USER_CACHE_SIZE=5):
+            self.assertEqual(get_user_cache().maxsize, 5)
+        self.assertIsNot(get_user_cache(), before)
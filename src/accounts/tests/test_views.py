@@ -1,9 +1,11 @@
 from unittest import mock
 
-from django.test import TestCase
+from django.core import mail
+from django.test import TestCase, override_settings
 from django.contrib import auth
 
-from accounts.models import Token
+from accounts.models import OutboundEmail, Token
+from accounts.outbox import send_queued_emails
 
 
 class SendLoginEmailViewTest(TestCase):
@@ -13,17 +15,33 @@ class SendLoginEmailViewTest(TestCase):
         )
         self.assertRedirects(response, "/")
 
-    @mock.patch("accounts.views.send_mail")
-    def test_sends_mail_to_address_from_post(self, mock_send_mail):
+    def test_queues_mail_instead_of_sending_inline(self):
         self.client.post(
             "/accounts/send_login_email", data={"email": "edith@example.com"}
         )
 
-        self.assertEqual(mock_send_mail.called, True)
-        (subject, body, from_email, to_list), kwargs = mock_send_mail.call_args
-        self.assertEqual(subject, "Your login link for Superlists")
-        self.assertEqual(from_email, "noreply@superlists")
-        self.assertEqual(to_list, ["edith@example.com"])
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(OutboundEmail.objects.get().to, "edith@example.com")
+
+    def test_sends_mail_to_address_from_post(self):
+        self.client.post(
+            "/accounts/send_login_email", data={"email": "edith@example.com"}
+        )
+        send_queued_emails()
+
+        (email,) = mail.outbox
+        self.assertEqual(email.subject, "Your login link for Superlists")
+        self.assertEqual(email.from_email, "noreply@superlists")
+        self.assertEqual(email.to, ["edith@example.com"])
+
+    @override_settings(EMAIL_OUTBOX_THREAD=True)
+    @mock.patch("accounts.views.outbox.wake_worker")
+    def test_wakes_outbox_worker_on_commit_when_enabled(self, mock_wake_worker):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                "/accounts/send_login_email", data={"email": "edith@example.com"}
+            )
+        self.assertTrue(mock_wake_worker.called)
 
     def test_adds_success_message(self):
         response = self.client.post(
@@ -52,16 +70,15 @@ class LoginViewTest(TestCase):
         token = Token.objects.get()
         self.assertEqual(token.email, "edith@example.com")
 
-    @mock.patch("accounts.views.send_mail")
-    def test_sends_link_to_login_using_token_uid(self, mock_send_mail):
+    def test_sends_link_to_login_using_token_uid(self):
         self.client.post(
             "/accounts/send_login_email", data={"email": "edith@example.com"}
         )
+        send_queued_emails()
 
         token = Token.objects.get()
         expected_url = f"http://testserver/accounts/login?token={token.uid}"
-        (subject, body, from_email, to_list), kwargs = mock_send_mail.call_args
-        self.assertIn(expected_url, body)
+        self.assertIn(expected_url, mail.outbox[0].body)
 
     def test_logs_in_if_given_valid_token(self):
         anon_user = auth.get_user(self.client)
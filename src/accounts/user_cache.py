@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+class UserCache:
+    def __init__(self, maxsize, ttl, alias=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.alias = alias
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def shared_key(self, email):
+        return f"accounts:user:{email}"
+
+    def get(self, email):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(email)
+                self.hits += 1
+                return entry[0]
+            self._entries.pop(email, None)
+        user = caches[self.alias].get(self.shared_key(email)) if self.alias else None
+        with self._lock:
+            if user is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._store(email, user, now)
+        return user
+
+    def set(self, email, user):
+        if self.alias:
+            caches[self.alias].set(self.shared_key(email), user, self.ttl)
+        with self._lock:
+            self._store(email, user, time.monotonic())
+
+    def _store(self, email, user, now):
+        if self.maxsize <= 0:
+            return
+        self._entries[email] = (user, now + self.ttl)
+        self._entries.move_to_end(email)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, email):
+        if self.alias:
+            caches[self.alias].delete(self.shared_key(email))
+        with self._lock:
+            self._entries.pop(email, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+_user_cache = None
+
+
+def get_user_cache():
+    global _user_cache
+    if _user_cache is None:
+        _user_cache = UserCache(
+            maxsize=settings.AUTH_USER_CACHE_SIZE,
+            ttl=settings.AUTH_USER_CACHE_TTL,
+            alias=settings.AUTH_USER_CACHE_ALIAS,
+        )
+    return _user_cache
+
+
+@receiver(setting_changed)
+def reset_user_cache(setting, **kwargs):
+    global _user_cache
+    if setting.startswith("AUTH_USER_CACHE"):
+        _user_cache = None
@@ -1,22 +1,25 @@
-from django.core.mail import send_mail
+from django.conf import settings
+from django.db import transaction
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.contrib import messages, auth
 
+from accounts import outbox
 from accounts.models import Token
 
 def send_login_email(request):
     email = request.POST["email"]
-    print(type(send_mail))
     token = Token.objects.create(email=email)
     url = request.build_absolute_uri(reverse("login") + "?token=" + str(token.uid))
     message_body = f"Use this link to log in:\n\n{url}"
-    send_mail(
+    outbox.queue_email(
         "Your login link for Superlists",
         message_body,
         "noreply@superlists",
-        [email],
+        email,
     )
+    if settings.EMAIL_OUTBOX_THREAD:
+        transaction.on_commit(outbox.wake_worker)
     messages.success(
         request,
         "Check your email, we've sent you a link you can use to log in.",
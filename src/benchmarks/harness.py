@@ -0,0 +1,72 @@
+import contextlib
+import os
+import statistics
+import time
+
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+
+@contextlib.contextmanager
+def test_database():
+    # Benchmarks seed a lot of throwaway data, so they always run against a
+    # fresh test database rather than the configured one.
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def summarize(latencies, elapsed):
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3) if latencies else None,
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3) if latencies else None,
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3) if latencies else None,
+    }
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+# Benchmarks that need several processes, or settings that only apply when a
+# connection is opened, run in spawned children configured from the
+# environment, exactly like a gunicorn worker.
+
+
+def setup_django(env, isolate_prefixes=()):
+    # Variables under isolate_prefixes come from env alone, not from the
+    # parent (the Docker image sets some), so a configuration that leaves
+    # one out really gets the settings default.
+    for name in list(os.environ):
+        if name.startswith(isolate_prefixes):
+            del os.environ[name]
+    os.environ.update(env)
+    import django
+
+    django.setup()
+    # Lets the test client through ALLOWED_HOSTS.
+    setup_test_environment()
+
+
+def migrate(env, isolate_prefixes=()):
+    setup_django(env, isolate_prefixes)
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
@@ -0,0 +1,88 @@
+import asyncio
+import itertools
+import json
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import AsyncClient, Client, override_settings
+
+from benchmarks.harness import summarize, test_database
+from benchmarks.seed import seed
+from lists.fragments import fragment_cache
+
+
+def seed_paths(items):
+    (owner,), lists = seed(users=1, lists_per_user=5, items_per_list=items)
+    paths = [list_.get_absolute_url() for list_ in lists]
+    return paths + ["/", f"/lists/users/{owner.email}/"]
+
+
+def run_wsgi(paths, total, concurrency):
+    requests = itertools.islice(itertools.cycle(paths), total)
+    lock = threading.Lock()
+    latencies = []
+
+    def worker():
+        client = Client()
+        while True:
+            with lock:
+                path = next(requests, None)
+            if path is None:
+                break
+            start = time.perf_counter()
+            response = client.get(path)
+            assert response.status_code == 200, (path, response.status_code)
+            latency = time.perf_counter() - start
+            with lock:
+                latencies.append(latency)
+        connection.close()
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, time.perf_counter() - start)
+
+
+async def run_asgi(paths, total, concurrency):
+    client = AsyncClient()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def fetch(path):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(path)
+            assert response.status_code == 200, (path, response.status_code)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(fetch(path) for path in itertools.islice(itertools.cycle(paths), total))
+    )
+    return summarize(latencies, time.perf_counter() - start)
+
+
+class Command(BaseCommand):
+    help = "Compare concurrent list reads through the WSGI and async view paths."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument("--concurrency", type=int, default=10)
+        parser.add_argument("--items", type=int, default=100)
+
+    def handle(self, *args, **options):
+        total, concurrency = options["requests"], options["concurrency"]
+        with test_database():
+            paths = seed_paths(options["items"])
+            fragment_cache().clear()
+            with override_settings(ROOT_URLCONF="superlists.urls"):
+                wsgi = run_wsgi(paths, total, concurrency)
+            fragment_cache().clear()
+            with override_settings(ROOT_URLCONF="superlists.async_urls"):
+                asgi = asyncio.run(run_asgi(paths, total, concurrency))
+        self.stdout.write(json.dumps({"wsgi": wsgi, "asgi": asgi}, indent=2))
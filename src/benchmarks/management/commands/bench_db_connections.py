@@ -0,0 +1,83 @@
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from benchmarks.harness import migrate, setup_django, summarize
+
+CONFIGURATIONS = {
+    "per_request": {},
+    "persistent": {
+        "DJANGO_DB_CONN_MAX_AGE": "600",
+        "DJANGO_DB_CONN_HEALTH_CHECKS": "1",
+    },
+}
+
+
+def wsgi_process(env, requests, results):
+    setup_django(env, isolate_prefixes=("DJANGO_DB_CONN_",))
+    from django.core.wsgi import get_wsgi_application
+    from django.db.backends.signals import connection_created
+    from django.test import RequestFactory
+
+    from lists.models import Item, List
+
+    # The test client keeps connections open across requests, so go through
+    # the WSGI handler, which closes them (or not) on request_finished.
+    application = get_wsgi_application()
+    our_list = List.objects.create()
+    Item.objects.create(list=our_list, text="persistent")
+    path = our_list.get_absolute_url()
+
+    opened = []
+    connection_created.connect(lambda sender, connection, **kwargs: opened.append(1))
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(requests):
+        environ = RequestFactory().get(path).environ
+        request_start = time.perf_counter()
+        response = application(environ, lambda status, headers: None)
+        b"".join(response)
+        response.close()
+        latencies.append(time.perf_counter() - request_start)
+        assert response.status_code == 200, response.status_code
+    elapsed = time.perf_counter() - start
+    results.put(
+        {
+            **summarize(latencies, elapsed),
+            "connections_per_request": round(len(opened) / requests, 3),
+        }
+    )
+
+
+class Command(BaseCommand):
+    help = "Measure per-request connection setup with and without persistent connections."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        context = multiprocessing.get_context("spawn")
+        results = {}
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                "DJANGO_SETTINGS_MODULE": os.environ["DJANGO_SETTINGS_MODULE"],
+                "DJANGO_DB_PATH": str(Path(directory) / "connections.sqlite3"),
+            }
+            migration = context.Process(target=migrate, args=(env,))
+            migration.start()
+            migration.join()
+            for name, overrides in CONFIGURATIONS.items():
+                queue = context.Queue()
+                process = context.Process(
+                    target=wsgi_process,
+                    args=({**env, **overrides}, options["requests"], queue),
+                )
+                process.start()
+                results[name] = queue.get()
+                process.join()
+        self.stdout.write(json.dumps(results, indent=2))
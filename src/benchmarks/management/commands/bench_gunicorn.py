@@ -0,0 +1,158 @@
+import http.client
+import itertools
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from benchmarks.harness import migrate, summarize
+
+HOST = "127.0.0.1"
+
+# Each model is the environment gunicorn.conf.py reads.
+WORKER_MODELS = {
+    "sync": {"GUNICORN_WORKERS": "4"},
+    "sync_preload": {"GUNICORN_WORKERS": "4", "GUNICORN_PRELOAD": "1"},
+    "gthread": {
+        "GUNICORN_WORKERS": "2",
+        "GUNICORN_WORKER_CLASS": "gthread",
+        "GUNICORN_THREADS": "4",
+    },
+    "gthread_preload": {
+        "GUNICORN_WORKERS": "2",
+        "GUNICORN_WORKER_CLASS": "gthread",
+        "GUNICORN_THREADS": "4",
+        "GUNICORN_PRELOAD": "1",
+    },
+}
+
+
+def seed_database(env, paths):
+    migrate(env)
+    from benchmarks.seed import seed
+
+    owners, lists = seed(users=5, lists_per_user=4, items_per_list=20)
+    paths.extend(
+        [list_.get_absolute_url() for list_ in lists]
+        + ["/"]
+        + [f"/lists/users/{owner.email}/" for owner in owners]
+    )
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_listening(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"gunicorn did not start listening on {port}")
+
+
+def run_load(port, paths, total, concurrency):
+    requests = itertools.islice(itertools.cycle(paths), total)
+    lock = threading.Lock()
+    latencies = []
+
+    def worker():
+        # One keep-alive connection per simulated client.
+        connection = http.client.HTTPConnection(HOST, port)
+        while True:
+            with lock:
+                path = next(requests, None)
+            if path is None:
+                break
+            start = time.perf_counter()
+            try:
+                connection.request("GET", path)
+                response = connection.getresponse()
+            except ConnectionError:
+                # A worker recycled by max_requests drops its keep-alive
+                # connections; a real client would reconnect too.
+                connection.close()
+                connection.request("GET", path)
+                response = connection.getresponse()
+            response.read()
+            assert response.status == 200, (path, response.status)
+            latency = time.perf_counter() - start
+            with lock:
+                latencies.append(latency)
+        connection.close()
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, time.perf_counter() - start)
+
+
+class Command(BaseCommand):
+    help = "Compare gunicorn worker models serving list reads over HTTP."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--model", action="append", choices=WORKER_MODELS)
+
+    def handle(self, *args, **options):
+        results = {}
+        context = multiprocessing.get_context("spawn")
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                **os.environ,
+                "DJANGO_SETTINGS_MODULE": os.environ["DJANGO_SETTINGS_MODULE"],
+                "DJANGO_DB_PATH": str(Path(directory) / "gunicorn.sqlite3"),
+            }
+            with context.Manager() as manager:
+                paths = manager.list()
+                seeding = context.Process(target=seed_database, args=(env, paths))
+                seeding.start()
+                seeding.join()
+                paths = list(paths)
+
+            for name in options["model"] or WORKER_MODELS:
+                port = free_port()
+                server = subprocess.Popen(
+                    [
+                        sys.executable,
+                        "-m",
+                        "gunicorn",
+                        "--config",
+                        str(settings.BASE_DIR / "gunicorn.conf.py"),
+                        "--bind",
+                        f"{HOST}:{port}",
+                        "--log-level",
+                        "warning",
+                        "superlists.wsgi:application",
+                    ],
+                    cwd=settings.BASE_DIR,
+                    env={**env, **WORKER_MODELS[name]},
+                )
+                try:
+                    wait_until_listening(port)
+                    run_load(port, paths, options["concurrency"] * 5, options["concurrency"])
+                    results[name] = run_load(
+                        port, paths, options["requests"], options["concurrency"]
+                    )
+                finally:
+                    server.terminate()
+                    server.wait()
+        self.stdout.write(json.dumps(results, indent=2))
@@ -0,0 +1,105 @@
+import json
+import random
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import F
+
+from benchmarks.harness import summarize, test_database, timed
+from lists.models import Item, List
+
+SEED_BATCH_SIZE = 10_000
+
+
+def seed_list(items):
+    our_list = List.objects.create()
+    for start in range(0, items, SEED_BATCH_SIZE):
+        Item.objects.bulk_create(
+            Item(list=our_list, text=f"item {n}")
+            for n in range(start, min(items, start + SEED_BATCH_SIZE))
+        )
+    return our_list, list(our_list.item_set.values_list("id", flat=True))
+
+
+def fractional_move(item_id, after_id):
+    Item.objects.get(id=item_id).move(after_id)
+
+
+def renumbering_move(item_id, after_id):
+    # The integer-position alternative: close the gap the item leaves and
+    # open one where it lands, shifting every item in between.
+    with transaction.atomic():
+        item = Item.objects.get(id=item_id)
+        siblings = Item.objects.filter(list_id=item.list_id).exclude(id=item_id)
+        target = (
+            siblings.get(id=after_id).position + 1 if after_id is not None else 1
+        )
+        if target > item.position:
+            target -= 1
+            siblings.filter(position__gt=item.position, position__lte=target).update(
+                position=F("position") - 1
+            )
+        else:
+            siblings.filter(position__gte=target, position__lt=item.position).update(
+                position=F("position") + 1
+            )
+        Item.objects.filter(id=item_id).update(position=target)
+        List.objects.filter(id=item.list_id).touch()
+
+
+def random_moves(ids, moves, rng):
+    # Each item goes to the top or after some other random item.
+    return [
+        (item_id, rng.choice([None, *rng.sample(ids, 5)]))
+        for item_id in rng.choices(ids, k=moves)
+    ]
+
+
+def time_moves(move, moves):
+    latencies = []
+    writes = []
+    elapsed = 0
+    for item_id, after_id in moves:
+        if item_id == after_id:
+            continue
+        changes = connection.connection.total_changes
+        latency, _ = timed(move, item_id, after_id)
+        writes.append(connection.connection.total_changes - changes)
+        latencies.append(latency)
+        elapsed += latency
+    return {
+        **summarize(latencies, elapsed),
+        "rows_written_per_move": round(sum(writes) / len(writes), 1),
+        "max_rows_written": max(writes),
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare fractional item moves with integer renumbering as lists grow."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+        )
+        parser.add_argument("--moves", type=int, default=200)
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        results = {}
+        with test_database():
+            for size in options["sizes"]:
+                our_list, ids = seed_list(size)
+                fractional = time_moves(
+                    fractional_move, random_moves(ids, options["moves"], rng)
+                )
+                # Renumbering needs whole-number positions to start from.
+                rebalance_time, _ = timed(our_list.rebalance)
+                renumbering = time_moves(
+                    renumbering_move, random_moves(ids, options["moves"], rng)
+                )
+                results[size] = {
+                    "fractional": fractional,
+                    "rebalance_seconds": round(rebalance_time, 2),
+                    "renumbering": renumbering,
+                }
+        self.stdout.write(json.dumps(results, indent=2))
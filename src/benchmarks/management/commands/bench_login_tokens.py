@@ -0,0 +1,63 @@
+import json
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts.management.commands.purge_tokens import purge_expired_tokens
+from accounts.models import Token
+from benchmarks.harness import summarize, test_database, timed
+
+SEED_BATCH_SIZE = 10_000
+
+
+def seed_stale_tokens(count):
+    created_at = timezone.now() - settings.LOGIN_TOKEN_TTL - timedelta(days=1)
+    for start in range(0, count, SEED_BATCH_SIZE):
+        Token.objects.bulk_create(
+            Token(email=f"stale{i}@example.com", uid=uuid.uuid4(), created_at=created_at)
+            for i in range(start, min(count, start + SEED_BATCH_SIZE))
+        )
+
+
+def time_logins(logins):
+    latencies = []
+    elapsed = 0
+    for i in range(logins):
+        token = Token.objects.create(email=f"login{i}@example.com")
+        latency, user = timed(authenticate, uid=str(token.uid))
+        assert user is not None
+        latencies.append(latency)
+        elapsed += latency
+    return summarize(latencies, elapsed)
+
+
+class Command(BaseCommand):
+    help = "Time passwordless logins against a table full of stale tokens."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stale", type=int, default=1_000_000)
+        parser.add_argument("--logins", type=int, default=500)
+
+    def handle(self, *args, **options):
+        with test_database():
+            seed_time, _ = timed(seed_stale_tokens, options["stale"])
+            with_stale = time_logins(options["logins"])
+            purge_time, purged = timed(purge_expired_tokens, 10_000)
+            after_purge = time_logins(options["logins"])
+        self.stdout.write(
+            json.dumps(
+                {
+                    "stale_tokens": options["stale"],
+                    "seed_seconds": round(seed_time, 2),
+                    "login_with_stale_tokens": with_stale,
+                    "purged": purged,
+                    "purge_seconds": round(purge_time, 2),
+                    "login_after_purge": after_purge,
+                },
+                indent=2,
+            )
+        )
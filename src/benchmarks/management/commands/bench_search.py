@@ -0,0 +1,80 @@
+import json
+import random
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from benchmarks.harness import summarize, test_database, timed
+from lists.models import Item, List
+from lists.search import search_items
+
+User = get_user_model()
+
+SEED_BATCH_SIZE = 10_000
+VOCABULARY_SIZE = 20_000
+
+
+def seed_items(items, users, lists_per_user, rng):
+    owners = User.objects.bulk_create(
+        User(email=f"user{n}@example.com") for n in range(users)
+    )
+    lists = List.objects.bulk_create(
+        List(owner=owner) for owner in owners for _ in range(lists_per_user)
+    )
+    vocabulary = [f"word{n}" for n in range(VOCABULARY_SIZE)]
+    for start in range(0, items, SEED_BATCH_SIZE):
+        Item.objects.bulk_create(
+            Item(
+                list=lists[n % len(lists)],
+                text=" ".join(rng.choices(vocabulary, k=4)) + f" #{n}",
+            )
+            for n in range(start, min(items, start + SEED_BATCH_SIZE))
+        )
+    return owners, vocabulary
+
+
+def time_searches(user, queries):
+    latencies = []
+    elapsed = 0
+    for query in queries:
+        latency, _ = timed(search_items, user, query)
+        latencies.append(latency)
+        elapsed += latency
+    return summarize(latencies, elapsed)
+
+
+class Command(BaseCommand):
+    help = "Compare FTS5 item search with the icontains fallback."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=1_000_000)
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--lists-per-user", type=int, default=1000)
+        parser.add_argument("--searches", type=int, default=100)
+        parser.add_argument("--fallback-searches", type=int, default=10)
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        with test_database():
+            seed_time, (owners, vocabulary) = timed(
+                seed_items, options["items"], options["users"], options["lists_per_user"], rng
+            )
+            queries = [
+                " ".join(rng.sample(vocabulary, k=rng.choice((1, 2))))
+                for _ in range(options["searches"])
+            ]
+            fts = time_searches(owners[0], queries)
+            with mock.patch("lists.search.search_index_available", return_value=False):
+                fallback = time_searches(owners[0], queries[: options["fallback_searches"]])
+        self.stdout.write(
+            json.dumps(
+                {
+                    "items": options["items"],
+                    "seed_seconds": round(seed_time, 2),
+                    "fts5": fts,
+                    "icontains_fallback": fallback,
+                },
+                indent=2,
+            )
+        )
@@ -0,0 +1,28 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from benchmarks.harness import test_database
+from benchmarks.scenarios import run_scenario
+from benchmarks.seed import seed
+
+
+class Command(BaseCommand):
+    help = "Compare queries and latency per authenticated request for each session mode."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+
+    def handle(self, *args, **options):
+        results = {}
+        with test_database():
+            owners, lists = seed(users=10, lists_per_user=5, items_per_list=10)
+            for mode, engine in settings.SESSION_ENGINES.items():
+                with override_settings(SESSION_ENGINE=engine):
+                    results[mode] = {
+                        name: run_scenario(name, owners, lists, options["requests"])
+                        for name in ("home_page", "view_list")
+                    }
+        self.stdout.write(json.dumps(results, indent=2))
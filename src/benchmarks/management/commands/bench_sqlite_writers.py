@@ -0,0 +1,106 @@
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError
+
+from benchmarks.harness import migrate, setup_django, summarize
+
+# Environment for each configuration; the writers read it when they set up
+# Django, exactly as a gunicorn worker would.
+CONFIGURATIONS = {
+    "defaults": {
+        "DJANGO_SQLITE_JOURNAL_MODE": "",
+        "DJANGO_SQLITE_SYNCHRONOUS": "",
+        "DJANGO_SQLITE_BUSY_TIMEOUT_MS": "",
+        "DJANGO_SQLITE_MMAP_SIZE": "",
+        "DJANGO_SQLITE_CACHE_SIZE": "",
+        "DJANGO_SQLITE_TEMP_STORE": "",
+        "DJANGO_SQLITE_TRANSACTION_MODE": "",
+    },
+    "tuned": {},
+}
+
+# Whatever a configuration leaves out falls back to the settings defaults,
+# never to the parent's environment. The journal mode sticks to the database
+# file, so that applies to the migration as well.
+ISOLATE_PREFIXES = ("DJANGO_SQLITE_",)
+
+
+def writer(env, writes, barrier, results):
+    setup_django(env, ISOLATE_PREFIXES)
+    from django.test import Client
+
+    client = Client()
+    latencies = []
+    locked = 0
+    list_url = None
+    barrier.wait()
+    start = time.time()
+    for n in range(writes):
+        request_start = time.perf_counter()
+        try:
+            if n % 5 == 0 or list_url is None:
+                response = client.post("/lists/new", data={"text": f"item {n}"})
+                list_url = response["Location"]
+            else:
+                client.post(list_url, data={"text": f"item {n}"})
+        except OperationalError:
+            locked += 1
+            continue
+        latencies.append(time.perf_counter() - request_start)
+    results.put((start, time.time(), latencies, locked))
+
+
+def run_configuration(env, processes, writes):
+    context = multiprocessing.get_context("spawn")
+    migration = context.Process(target=migrate, args=(env, ISOLATE_PREFIXES))
+    migration.start()
+    migration.join()
+
+    barrier = context.Barrier(processes)
+    results = context.Queue()
+    writers = [
+        context.Process(target=writer, args=(env, writes, barrier, results))
+        for _ in range(processes)
+    ]
+    for process in writers:
+        process.start()
+    finished = [results.get() for _ in writers]
+    for process in writers:
+        process.join()
+
+    elapsed = max(end for _, end, _, _ in finished) - min(
+        start for start, _, _, _ in finished
+    )
+    latencies = [latency for _, _, times, _ in finished for latency in times]
+    return {
+        **summarize(latencies, elapsed),
+        "database_locked": sum(locked for *_, locked in finished),
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare concurrent writers against SQLite with default and tuned pragmas."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=4)
+        parser.add_argument("--writes", type=int, default=200)
+
+    def handle(self, *args, **options):
+        results = {}
+        with tempfile.TemporaryDirectory() as directory:
+            for name, overrides in CONFIGURATIONS.items():
+                env = {
+                    "DJANGO_SETTINGS_MODULE": os.environ["DJANGO_SETTINGS_MODULE"],
+                    "DJANGO_DB_PATH": str(Path(directory) / f"{name}.sqlite3"),
+                    **overrides,
+                }
+                results[name] = run_configuration(
+                    env, options["processes"], options["writes"]
+                )
+        self.stdout.write(json.dumps(results, indent=2))
@@ -0,0 +1,81 @@
+import json
+import re
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.template import engines
+from django.test import RequestFactory
+from django.utils.safestring import mark_safe
+
+from benchmarks.harness import summarize, timed
+from lists.forms import ExistingListItemForm
+from lists.models import Item, List
+
+CSRF_TOKEN = re.compile(r'name="csrfmiddlewaretoken" value="[^"]+"')
+
+
+def list_contexts(items):
+    # Unsaved objects, so only template rendering is measured.
+    our_list = List(id=1, owner_id="owner@example.com")
+    item_page = {
+        "items": [
+            Item(id=n, list=our_list, text=f"item <{n}> & 'more'")
+            for n in range(1, items + 1)
+        ],
+        "item_offset": 0,
+        "next_after": None,
+        "is_first_page": True,
+    }
+    return our_list, {"list": our_list, **item_page}
+
+
+def render_list_page(engine, our_list, item_context, request):
+    # What view_list does on a fragment cache miss.
+    items_fragment = engine.get_template("list_items.html").render(item_context)
+    sharing_fragment = engine.get_template("list_sharing.html").render(
+        {"list": our_list, "sharees": []}
+    )
+    return engine.get_template("list.html").render(
+        {
+            "list": our_list,
+            "form": ExistingListItemForm(for_list=our_list),
+            "items_fragment": mark_safe(items_fragment),
+            "sharing_fragment": mark_safe(sharing_fragment),
+        },
+        request,
+    )
+
+
+def time_renders(render, renders):
+    latencies = []
+    elapsed = 0
+    for _ in range(renders):
+        latency, html = timed(render)
+        latencies.append(latency)
+        elapsed += latency
+    return summarize(latencies, elapsed), html
+
+
+class Command(BaseCommand):
+    help = "Render a large list page with the Django and Jinja2 template engines."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=10_000)
+        parser.add_argument("--renders", type=int, default=50)
+
+    def handle(self, *args, **options):
+        our_list, item_context = list_contexts(options["items"])
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+        results = {}
+        pages = {}
+        for name in ("django", "jinja2"):
+            engine = engines[name]
+            results[name], pages[name] = time_renders(
+                lambda: render_list_page(engine, our_list, item_context, request),
+                options["renders"],
+            )
+        pages = {name: CSRF_TOKEN.sub("", html) for name, html in pages.items()}
+        results["identical_output"] = pages["django"] == pages["jinja2"]
+        results["items"] = options["items"]
+        self.stdout.write(json.dumps(results, indent=2))
@@ -0,0 +1,69 @@
+import json
+import platform
+import subprocess
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.harness import test_database, timed
+from benchmarks.scenarios import SCENARIOS, run_scenario
+from benchmarks.seed import seed
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic data and drive the main views through the test client, "
+        "reporting throughput, latency percentiles and query counts as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--lists-per-user", type=int, default=10)
+        parser.add_argument("--items-per-list", type=int, default=20)
+        parser.add_argument("--share-fanout", type=int, default=3)
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=sorted(SCENARIOS),
+            help="Scenario to run; repeat for several. Defaults to all of them.",
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        if options["users"] < 1:
+            raise CommandError("--users must be at least 1")
+        scale = {
+            key: options[key]
+            for key in ("users", "lists_per_user", "items_per_list", "share_fanout")
+        }
+        report = {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "scale": scale,
+            "requests": options["requests"],
+            "scenarios": {},
+        }
+        with test_database():
+            seed_seconds, (owners, lists) = timed(seed, **scale)
+            report["seed_seconds"] = round(seed_seconds, 2)
+            for name in options["scenario"] or SCENARIOS:
+                report["scenarios"][name] = run_scenario(
+                    name, owners, lists, options["requests"]
+                )
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        self.stdout.write(output)
@@ -0,0 +1,71 @@
+import random
+import time
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from benchmarks.harness import summarize
+
+
+def home_page(owners, lists):
+    return lambda client, n: client.get("/")
+
+
+def new_list(owners, lists):
+    return lambda client, n: client.post("/lists/new", data={"text": f"new list {n}"})
+
+
+def view_list(owners, lists):
+    rng = random.Random(0)
+    return lambda client, n: client.get(rng.choice(lists).get_absolute_url())
+
+
+def my_lists(owners, lists):
+    rng = random.Random(0)
+    return lambda client, n: client.get(f"/lists/users/{rng.choice(owners).email}/")
+
+
+def share_list(owners, lists):
+    rng = random.Random(0)
+    return lambda client, n: client.post(
+        f"/lists/{rng.choice(lists).id}/share",
+        data={"sharee": rng.choice(owners).email},
+    )
+
+
+SCENARIOS = {
+    "home_page": home_page,
+    "new_list": new_list,
+    "view_list": view_list,
+    "my_lists": my_lists,
+    "share_list": share_list,
+}
+
+
+def run_scenario(name, owners, lists, requests, warmup=10):
+    client = Client()
+    client.force_login(owners[0])
+    make_request = SCENARIOS[name](owners, lists)
+    for n in range(warmup):
+        make_request(client, -n - 1)
+
+    latencies = []
+    query_counts = []
+    start = time.perf_counter()
+    for n in range(requests):
+        with CaptureQueriesContext(connection) as queries:
+            request_start = time.perf_counter()
+            response = make_request(client, n)
+            latencies.append(time.perf_counter() - request_start)
+        if response.status_code >= 400:
+            raise AssertionError(f"{name} returned {response.status_code}")
+        query_counts.append(len(queries))
+    elapsed = time.perf_counter() - start
+
+    query_counts.sort()
+    return {
+        **summarize(latencies, elapsed),
+        "queries_mean": round(sum(query_counts) / len(query_counts), 2),
+        "queries_max": query_counts[-1],
+    }
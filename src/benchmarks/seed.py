@@ -0,0 +1,38 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from lists.models import Item, List
+
+User = get_user_model()
+
+BATCH_SIZE = 5000
+
+
+def seed(users, lists_per_user, items_per_list, share_fanout=0):
+    with transaction.atomic():
+        owners = User.objects.bulk_create(
+            User(email=f"user{n}@example.com") for n in range(users)
+        )
+        lists = List.objects.bulk_create(
+            (List(owner=owner) for owner in owners for _ in range(lists_per_user)),
+            batch_size=BATCH_SIZE,
+        )
+        Item.objects.bulk_create(
+            (
+                Item(list=list_, text=f"item {n}")
+                for list_ in lists
+                for n in range(items_per_list)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        Share = List.shared_with.through
+        fanout = min(share_fanout, users - 1)
+        Share.objects.bulk_create(
+            (
+                Share(list_id=list_.id, user_id=owners[(i // lists_per_user + k) % users].email)
+                for i, list_ in enumerate(lists)
+                for k in range(1, fanout + 1)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+    return owners, lists
@@ -0,0 +1,43 @@
+from django.test import TestCase
+
+from benchmarks.harness import percentile, summarize
+from benchmarks.scenarios import SCENARIOS, run_scenario
+from benchmarks.seed import seed
+from lists.models import Item, List
+
+
+class HarnessTest(TestCase):
+    def test_percentile_picks_nearest_rank(self):
+        values = [float(n) for n in range(1, 101)]
+        self.assertEqual(percentile(values, 0.5), 51.0)
+        self.assertEqual(percentile(values, 0.99), 99.0)
+
+    def test_summarize_reports_throughput_and_percentiles(self):
+        summary = summarize([0.001, 0.002, 0.003, 0.004], elapsed=0.01)
+        self.assertEqual(summary["requests"], 4)
+        self.assertEqual(summary["throughput_rps"], 400.0)
+        self.assertEqual(summary["p50_ms"], 3.0)
+
+
+class SeedTest(TestCase):
+    def test_seeds_requested_scale(self):
+        owners, lists = seed(
+            users=3, lists_per_user=2, items_per_list=4, share_fanout=2
+        )
+        self.assertEqual(len(owners), 3)
+        self.assertEqual(List.objects.count(), 6)
+        self.assertEqual(Item.objects.count(), 24)
+        self.assertEqual(List.shared_with.through.objects.count(), 12)
+        self.assertFalse(
+            List.objects.filter(shared_with=owners[0], owner=owners[0]).exists()
+        )
+
+
+class ScenarioTest(TestCase):
+    def test_every_scenario_runs(self):
+        owners, lists = seed(users=2, lists_per_user=2, items_per_list=2, share_fanout=1)
+        for name in SCENARIOS:
+            with self.subTest(name):
+                result = run_scenario(name, owners, lists, requests=3, warmup=1)
+                self.assertEqual(result["requests"], 3)
+                self.assertGreater(result["queries_mean"], 0)
@@ -1,6 +1,7 @@
+from importlib import import_module
+
 from django.conf import settings
 from django.contrib.auth import BACKEND_SESSION_KEY, SESSION_KEY, get_user_model
-from django.contrib.sessions.backends.db import SessionStore
 from django.core.management.base import BaseCommand
 
 User = get_user_model()
@@ -15,10 +16,17 @@ class Command(BaseCommand):
         self.stdout.write(session_key)
 
 
+def pre_authenticated_session_data(user):
+    return {
+        SESSION_KEY: user.pk,
+        BACKEND_SESSION_KEY: settings.AUTHENTICATION_BACKENDS[0],
+    }
+
+
 def create_pre_authenticated_session(email):
     user = User.objects.create(email=email)
-    session = SessionStore()
-    session[SESSION_KEY] = user.pk
-    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    # For signed cookies the "session key" is the signed cookie value itself.
+    session = import_module(settings.SESSION_ENGINE).SessionStore()
+    session.update(pre_authenticated_session_data(user))
     session.save()
     return session.session_key
@@ -0,0 +1,98 @@
+import csv
+import secrets
+from datetime import timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.backends.db import SessionStore as DBSessionStore
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from .create_session import pre_authenticated_session_data
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-create users with pre-authenticated sessions and write "
+        "'email,session_key' rows to a CSV file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("count", type=int)
+        parser.add_argument("--output", default="sessions.csv")
+        parser.add_argument("--prefix", default="loadtest")
+        parser.add_argument("--domain", default="example.com")
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        emails = (
+            f"{options['prefix']}{n}@{options['domain']}"
+            for n in range(options["count"])
+        )
+        with open(options["output"], "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["email", "session_key"])
+            created = 0
+            for rows in create_pre_authenticated_sessions(emails, options["batch_size"]):
+                writer.writerows(rows)
+                created += len(rows)
+        self.stdout.write(f"Wrote {created} sessions to {options['output']}")
+
+
+def batched(iterable, size):
+    batch = []
+    for value in iterable:
+        batch.append(value)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def create_pre_authenticated_sessions(emails, batch_size=10_000):
+    SessionStore = import_module(settings.SESSION_ENGINE).SessionStore
+    if issubclass(SessionStore, DBSessionStore):
+        create_sessions = create_db_sessions
+    else:
+        create_sessions = create_store_sessions
+    for batch in batched(emails, batch_size):
+        users = [User(email=email) for email in batch]
+        with transaction.atomic():
+            User.objects.bulk_create(users, ignore_conflicts=True)
+            session_keys = create_sessions(users, SessionStore)
+        yield list(zip([user.email for user in users], session_keys))
+
+
+def create_db_sessions(users, SessionStore):
+    # A multi-row INSERT per batch instead of a session INSERT per user.
+    # cached_db stores fill their cache from these rows on first read.
+    store = SessionStore()
+    expire_date = timezone.now() + timedelta(seconds=settings.SESSION_COOKIE_AGE)
+    sessions = [
+        Session(
+            # Same length and alphabet as SessionStore keys, generated
+            # without the per-character overhead of get_random_string.
+            session_key=secrets.token_hex(16),
+            session_data=store.encode(pre_authenticated_session_data(user)),
+            expire_date=expire_date,
+        )
+        for user in users
+    ]
+    Session.objects.bulk_create(sessions)
+    return [session.session_key for session in sessions]
+
+
+def create_store_sessions(users, SessionStore):
+    session_keys = []
+    for user in users:
+        session = SessionStore()
+        session.update(pre_authenticated_session_data(user))
+        session.save()
+        session_keys.append(session.session_key)
+    return session_keys
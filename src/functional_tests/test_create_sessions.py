@@ -0,0 +1,107 @@
+import csv
+import os
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from accounts.user_cache import get_user_cache
+from .management.commands.create_session import create_pre_authenticated_session
+
+User = get_user_model()
+
+
+class CreateSessionsCommandTest(TestCase):
+    def setUp(self):
+        fd, self.output = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        self.addCleanup(os.remove, self.output)
+
+    def create_sessions(self, count, **options):
+        call_command(
+            "create_sessions", count, output=self.output, stdout=StringIO(), **options
+        )
+        with open(self.output, newline="") as f:
+            return list(csv.DictReader(f))
+
+    def test_writes_one_session_per_user(self):
+        rows = self.create_sessions(5, batch_size=2)
+        self.assertEqual(
+            [row["email"] for row in rows],
+            [f"loadtest{n}@example.com" for n in range(5)],
+        )
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(len({row["session_key"] for row in rows}), 5)
+
+    def test_sessions_are_logged_in_as_their_user(self):
+        (row,) = self.create_sessions(1)
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = row["session_key"]
+        user = auth.get_user(self.client)
+        self.assertTrue(user.is_authenticated)
+        self.assertEqual(user.email, row["email"])
+
+    def test_reuses_existing_users(self):
+        User.objects.create(email="loadtest0@example.com")
+        rows = self.create_sessions(2)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(User.objects.count(), 2)
+
+
+class SessionModesTest(TestCase):
+    def setUp(self):
+        get_user_cache().clear()
+
+    def log_in_with(self, session_key):
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = session_key
+        return self.client
+
+    def assertLoggedInAs(self, email):
+        user = auth.get_user(self.client)
+        self.assertTrue(user.is_authenticated)
+        self.assertEqual(user.email, email)
+
+    def test_pre_authenticated_session_works_with_every_engine(self):
+        for mode, engine in settings.SESSION_ENGINES.items():
+            with self.subTest(mode), override_settings(SESSION_ENGINE=engine):
+                email = f"{mode}@example.com"
+                self.log_in_with(create_pre_authenticated_session(email))
+                self.assertLoggedInAs(email)
+
+    def test_bulk_sessions_work_with_every_engine(self):
+        fd, output = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        self.addCleanup(os.remove, output)
+        for mode, engine in settings.SESSION_ENGINES.items():
+            with self.subTest(mode), override_settings(SESSION_ENGINE=engine):
+                call_command(
+                    "create_sessions", 2, prefix=mode, output=output, stdout=StringIO()
+                )
+                with open(output, newline="") as f:
+                    row = list(csv.DictReader(f))[-1]
+                self.log_in_with(row["session_key"])
+                self.assertLoggedInAs(row["email"])
+
+    def assertQueriesPerAuthenticatedRequest(self, engine, expected):
+        with override_settings(SESSION_ENGINE=engine):
+            self.log_in_with(create_pre_authenticated_session("edith@example.com"))
+            self.client.get("/")
+            with self.assertNumQueries(expected):
+                response = self.client.get("/")
+        self.assertContains(response, "Logged in as edith@example.com")
+
+    def test_db_sessions_read_the_session_table(self):
+        self.assertQueriesPerAuthenticatedRequest(settings.SESSION_ENGINES["db"], 1)
+
+    def test_cached_db_sessions_skip_the_session_table(self):
+        self.assertQueriesPerAuthenticatedRequest(
+            settings.SESSION_ENGINES["cached_db"], 0
+        )
+
+    def test_signed_cookie_sessions_skip_the_session_table(self):
+        self.assertQueriesPerAuthenticatedRequest(
+            settings.SESSION_ENGINES["signed_cookies"], 0
+        )
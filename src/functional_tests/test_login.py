@@ -4,6 +4,8 @@ from django.core import mail
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 
+from accounts.outbox import send_queued_emails
+
 from .base import FunctionalTest
 
 TEST_EMAIL = "edith@example.com"
@@ -33,6 +35,7 @@ class LoginTest(FunctionalTest):
             return
 
         # She checks her email and finds a message
+        send_queued_emails()
         email = mail.outbox.pop()
         self.assertIn(TEST_EMAIL, email.to)
         self.assertEqual(email.subject, SUBJECT)
@@ -0,0 +1,34 @@
+import multiprocessing
+import os
+
+# Picked up automatically when gunicorn runs from src/. Every setting can be
+# overridden from the environment so the worker model is a deploy-time
+# choice; see the "Benchmarks" section of the README for how they compare.
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "superlists.settings")
+
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+# More than one thread switches the default sync worker to gthread.
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+# Loading the app before forking shares its memory between workers and
+# surfaces import errors at startup rather than in every worker.
+preload_app = "GUNICORN_PRELOAD" in os.environ
+# Recycle workers now and then so slow leaks can't grow forever; the jitter
+# stops them all restarting at once.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+
+def post_fork(server, worker):
+    import django
+    from django.db import connections
+    from django.urls import reverse
+
+    django.setup()
+    # With preload_app the master may have opened connections while
+    # importing the app; a forked worker must never share them.
+    connections.close_all()
+    # Build the URL resolver before the first request rather than during it.
+    reverse("home")
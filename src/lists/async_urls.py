@@ -0,0 +1,11 @@
+from django.urls import path
+
+from lists import async_views
+from lists.urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path("", async_views.home_page, name="home"),
+    path("<int:list_id>/", async_views.view_list, name="view_list"),
+    path("users/<str:email>/", async_views.my_lists, name="my_lists"),
+    *sync_urlpatterns,
+]
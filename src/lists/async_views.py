@@ -0,0 +1,89 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.shortcuts import render
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from lists import fragments, views
+from lists.forms import ExistingListItemForm, ItemForm
+from lists.models import List
+
+User = get_user_model()
+
+# Async counterparts of the read views in lists.views. Everything that touches
+# the database is awaited before rendering, so templates never hit the ORM
+# from the event loop. Writes still go through the sync views.
+
+
+async def load_user(request):
+    # The auth and messages context processors read request.user and the
+    # session, so resolve both up front.
+    request.user = await request.auser()
+
+
+async def home_page(request):
+    await load_user(request)
+    return render(request, "home.html", {"form": ItemForm()})
+
+
+async def get_item_page(our_list, cursor=(None, 0)):
+    page = [item async for item in views.item_page_queryset(our_list, cursor[0])]
+    return views.item_page_context(page, cursor)
+
+
+async def render_list_fragments(our_list, cursor):
+    item_page = await get_item_page(our_list, cursor)
+    sharees = [sharee async for sharee in our_list.shared_with.all()]
+    return views.render_fragments(our_list, item_page, sharees)
+
+
+@condition(etag_func=views.list_etag)
+async def render_list(request, list_id):
+    our_list = request.list
+    cursor = views.parse_cursor(request)
+    return render(
+        request,
+        "list.html",
+        {
+            "list": our_list,
+            "form": ExistingListItemForm(for_list=our_list),
+            **await fragments.aget_or_render(
+                our_list,
+                cursor,
+                lambda: render_list_fragments(our_list, cursor),
+            ),
+        },
+    )
+
+
+@cache_control(**views.PRIVATE_PAGE)
+async def view_list(request, list_id):
+    if request.method not in ("GET", "HEAD"):
+        return await sync_to_async(views.view_list)(request, list_id)
+    request.list = await List.objects.aget(id=list_id)
+    # Before the ETag, which looks at any messages kept in the session.
+    await load_user(request)
+    return await render_list(request, list_id)
+
+
+@condition(etag_func=views.my_lists_etag)
+async def render_my_lists(request, email):
+    owner = await User.objects.aget(email=email)
+    return render(
+        request,
+        "my_lists.html",
+        {
+            "owner": owner,
+            "owned_lists": [list_ async for list_ in owner.lists.with_names()],
+            "shared_lists": [list_ async for list_ in owner.shared_lists.with_names()],
+        },
+    )
+
+
+@cache_control(**views.PRIVATE_PAGE)
+async def my_lists(request, email):
+    request.my_lists_state = await views.users_lists(email).aaggregate(
+        **views.MY_LISTS_STATE
+    )
+    await load_user(request)
+    return await render_my_lists(request, email)
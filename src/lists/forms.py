@@ -1,9 +1,6 @@
 from django import forms
-from django.core.exceptions import ValidationError
-from lists.models import Item
-
-EMPTY_ITEM_ERROR = "You can't have an empty list item"
-DUPLICATE_ITEM_ERROR = "You've already got this in your list"
+from django.db import IntegrityError, transaction
+from lists.models import DUPLICATE_ITEM_ERROR, EMPTY_ITEM_ERROR, Item
 
 
 class ItemForm(forms.models.ModelForm):
@@ -30,12 +27,21 @@ class ExistingListItemForm(ItemForm):
         super().__init__(*args, **kwargs)
         self.instance.list = for_list
 
-    def save(self):
-        return forms.models.ModelForm.save(self)
-
     def validate_unique(self):
+        # Left to the database's unique_together constraint, see save().
+        pass
+
+    def save(self):
+        # Insert first rather than SELECTing for a duplicate beforehand. The
+        # savepoint keeps any surrounding transaction usable after a clash.
         try:
-            self.instance.validate_unique()
-        except ValidationError as e:
-            e.error_dict = {"text": [DUPLICATE_ITEM_ERROR]}
-            self._update_errors(e)
+            with transaction.atomic():
+                return forms.models.ModelForm.save(self)
+        except IntegrityError:
+            # Only the unique_together clash is the user's doing.
+            if not Item.objects.filter(
+                list=self.instance.list, text=self.instance.text
+            ).exists():
+                raise
+            self.add_error("text", DUPLICATE_ITEM_ERROR)
+            return None
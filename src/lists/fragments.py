@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.cache import caches
+
+
+def fragment_cache():
+    return caches[settings.LIST_FRAGMENT_CACHE]
+
+
+def fragment_key(our_list, cursor):
+    version = our_list.updated_at.timestamp()
+    after, start = cursor
+    page = "first" if after is None else f"{after}:{start}"
+    return f"lists:{our_list.id}:{version}:{page}"
+
+
+def get_or_render(our_list, cursor, render_fragments):
+    cache = fragment_cache()
+    key = fragment_key(our_list, cursor)
+    fragments = cache.get(key)
+    if fragments is None:
+        fragments = render_fragments()
+        cache.set(key, fragments)
+    return fragments
+
+
+async def aget_or_render(our_list, cursor, render_fragments):
+    cache = fragment_cache()
+    key = fragment_key(our_list, cursor)
+    fragments = await cache.aget(key)
+    if fragments is None:
+        fragments = await render_fragments()
+        await cache.aset(key, fragments)
+    return fragments
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from lists.models import List
+
+
+class Command(BaseCommand):
+    help = "Respace item positions in lists that moves have flagged, e.g. from cron."
+
+    def handle(self, *args, **options):
+        rebalanced = rebalance_flagged_lists()
+        self.stdout.write(f"Rebalanced {rebalanced} lists")
+
+
+def rebalance_flagged_lists():
+    # Collected up front: rebalancing clears the flag being filtered on.
+    flagged = list(List.objects.filter(needs_rebalance=True).only("id"))
+    for our_list in flagged:
+        our_list.rebalance()
+    return len(flagged)
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.1 on 2026-10-17 09:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0008_list_shared_with'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='list',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,71 @@
+from django.db import migrations
+
+# An external-content FTS5 index over lists_item.text. The triggers keep it in
+# step with every write, including bulk_create and queryset updates/deletes
+# that never send model signals. Other backends fall back to icontains in
+# lists.search, so there is nothing to create for them.
+
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE lists_item_fts USING fts5(
+        text, content='lists_item', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER lists_item_fts_insert AFTER INSERT ON lists_item BEGIN
+        INSERT INTO lists_item_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER lists_item_fts_delete AFTER DELETE ON lists_item BEGIN
+        INSERT INTO lists_item_fts(lists_item_fts, rowid, text)
+        VALUES ('delete', old.id, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER lists_item_fts_update AFTER UPDATE OF text ON lists_item BEGIN
+        INSERT INTO lists_item_fts(lists_item_fts, rowid, text)
+        VALUES ('delete', old.id, old.text);
+        INSERT INTO lists_item_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    "INSERT INTO lists_item_fts(lists_item_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS lists_item_fts_update",
+    "DROP TRIGGER IF EXISTS lists_item_fts_delete",
+    "DROP TRIGGER IF EXISTS lists_item_fts_insert",
+    "DROP TABLE IF EXISTS lists_item_fts",
+]
+
+
+def fts5_available(schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return False
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return ("ENABLE_FTS5",) in cursor.fetchall()
+
+
+def create_search_index(apps, schema_editor):
+    if fts5_available(schema_editor):
+        for sql in CREATE_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for sql in DROP_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0009_list_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
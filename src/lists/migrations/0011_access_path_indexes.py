@@ -0,0 +1,80 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# The composite indexes below start with the foreign key columns, which makes
+# Django's single-column FK indexes redundant. Altering db_index normally
+# rebuilds the table on SQLite, which would copy every item and drop the
+# search triggers from 0010, so only the index is dropped in the database.
+FK_INDEXES = [("item", "list_id"), ("list", "owner_id")]
+
+
+def fk_index_names(schema_editor, model, column):
+    with schema_editor.connection.cursor() as cursor:
+        constraints = schema_editor.connection.introspection.get_constraints(
+            cursor, model._meta.db_table
+        )
+    return [
+        name
+        for name, info in constraints.items()
+        if info["index"] and not info["unique"] and info["columns"] == [column]
+    ]
+
+
+def drop_fk_indexes(apps, schema_editor):
+    for model_name, column in FK_INDEXES:
+        model = apps.get_model("lists", model_name)
+        for name in fk_index_names(schema_editor, model, column):
+            schema_editor.execute(f"DROP INDEX {schema_editor.quote_name(name)}")
+
+
+def restore_fk_indexes(apps, schema_editor):
+    for model_name, column in FK_INDEXES:
+        table = apps.get_model("lists", model_name)._meta.db_table
+        schema_editor.execute(
+            f"CREATE INDEX {schema_editor.quote_name(f'{table}_{column}')}"
+            f" ON {schema_editor.quote_name(table)} ({schema_editor.quote_name(column)})"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0010_item_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='item',
+                    name='list',
+                    field=models.ForeignKey(db_index=False, default=None, on_delete=django.db.models.deletion.CASCADE, to='lists.list'),
+                ),
+                migrations.AlterField(
+                    model_name='list',
+                    name='owner',
+                    field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='lists', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(drop_fk_indexes, restore_fk_indexes),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['list', 'id'], name='lists_item_list_id_id'),
+        ),
+        migrations.AddIndex(
+            model_name='list',
+            index=models.Index(fields=['owner', 'updated_at'], name='lists_list_owner_updated'),
+        ),
+        # The auto-created through table can't declare indexes. Its user_id
+        # index alone still has to visit each row for list_id.
+        migrations.RunSQL(
+            "CREATE INDEX lists_list_shared_with_user_list"
+            " ON lists_list_shared_with (user_id, list_id)",
+            "DROP INDEX lists_list_shared_with_user_list",
+        ),
+    ]
@@ -0,0 +1,80 @@
+from django.db import migrations, models
+
+# Adding a NOT NULL column with a default rebuilds the table on SQLite, which
+# would copy every item and drop the search triggers from 0010. SQLite can
+# add such a column in place as long as it has a constant default, so add
+# (and on rollback, drop) both columns that way. The defaults are never used:
+# Item.save() and the bulk paths always supply a position.
+
+
+def add_column(model_name, field_name, default):
+    def add(apps, schema_editor):
+        model = apps.get_model("lists", model_name)
+        field = model._meta.get_field(field_name)
+        definition, params = schema_editor.column_sql(model, field)
+        schema_editor.execute(
+            f"ALTER TABLE {schema_editor.quote_name(model._meta.db_table)}"
+            f" ADD COLUMN {schema_editor.quote_name(field.column)} {definition}"
+            f" DEFAULT {default}",
+            params,
+        )
+
+    def remove(apps, schema_editor):
+        # In place too: remove_field would rebuild the table on SQLite.
+        # Needs SQLite 3.35+, and runs after the column's indexes are gone.
+        model = apps.get_model("lists", model_name)
+        field = model._meta.get_field(field_name)
+        schema_editor.execute(
+            f"ALTER TABLE {schema_editor.quote_name(model._meta.db_table)}"
+            f" DROP COLUMN {schema_editor.quote_name(field.column)}"
+        )
+
+    return migrations.RunPython(add, remove)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0011_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterModelOptions(
+                    name='item',
+                    options={'ordering': ('position', 'id')},
+                ),
+                migrations.AddField(
+                    model_name='item',
+                    name='position',
+                    field=models.FloatField(blank=True),
+                    preserve_default=False,
+                ),
+                migrations.AddField(
+                    model_name='list',
+                    name='needs_rebalance',
+                    field=models.BooleanField(default=False),
+                ),
+            ],
+        ),
+        add_column('item', 'position', 0),
+        add_column('list', 'needs_rebalance', 0),
+        # Keeps the existing order.
+        migrations.RunSQL(
+            "UPDATE lists_item SET position = id",
+            migrations.RunSQL.noop,
+        ),
+        migrations.RemoveIndex(
+            model_name='item',
+            name='lists_item_list_id_id',
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['list', 'position'], name='lists_item_list_position'),
+        ),
+        migrations.AddIndex(
+            model_name='list',
+            index=models.Index(condition=models.Q(('needs_rebalance', True)), fields=['needs_rebalance'], name='lists_list_needs_rebalance'),
+        ),
+    ]
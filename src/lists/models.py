@@ -1,7 +1,52 @@
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.utils import timezone
+
+EMPTY_ITEM_ERROR = "You can't have an empty list item"
+DUPLICATE_ITEM_ERROR = "You've already got this in your list"
+BULK_ADD_BATCH_SIZE = 500
+# Moving an item halves the gap it lands in. Below this the list is flagged
+# for rebalance_item_positions, well before doubles run out of precision.
+MIN_POSITION_GAP = 1e-6
+
+
+def is_valid_email(email):
+    try:
+        validate_email(email)
+    except ValidationError:
+        return False
+    return True
+
+
+class ListQuerySet(models.QuerySet):
+    def with_names(self):
+        first_item = Item.objects.filter(list=models.OuterRef("pk")).values("text")[:1]
+        return self.annotate(first_item_text=models.Subquery(first_item))
+
+    def touch(self, **fields):
+        return self.update(updated_at=timezone.now(), **fields)
+
+    def visible_to(self, user):
+        # Owned or shared lists. Matching the sharing rows in a subquery
+        # rather than joining them lets SQLite answer each side of the OR
+        # from an index instead of scanning every list.
+        shared = List.shared_with.through.objects.filter(user=user).values("list_id")
+        return self.filter(models.Q(owner=user) | models.Q(id__in=shared))
+
+    def create_with_item(self, text, owner=None):
+        # One transaction, so a failed item insert can't leave an empty list
+        # behind. bulk_create skips the post_save touch: the list was only
+        # just stamped by its own INSERT.
+        with transaction.atomic():
+            new_list = self.create(owner=owner)
+            Item.objects.bulk_create([Item(list=new_list, text=text, position=1.0)])
+        return new_list
+
 
 # Create your models here.
 class List(models.Model):
@@ -11,11 +56,28 @@ class List(models.Model):
         blank=True,
         null=True,
         on_delete=models.CASCADE,
+        db_index=False,
     )
     shared_with = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
         related_name="shared_lists",
     )
+    updated_at = models.DateTimeField(auto_now=True)
+    needs_rebalance = models.BooleanField(default=False)
+
+    objects = ListQuerySet.as_manager()
+
+    class Meta:
+        # Leads with owner_id for the owner's lists, and carries updated_at
+        # for the my_lists freshness check.
+        indexes = [
+            models.Index(fields=["owner", "updated_at"], name="lists_list_owner_updated"),
+            models.Index(
+                fields=["needs_rebalance"],
+                condition=models.Q(needs_rebalance=True),
+                name="lists_list_needs_rebalance",
+            ),
+        ]
 
     def get_absolute_url(self):
         return reverse("view_list", args=[self.id])
@@ -26,18 +88,215 @@ class List(models.Model):
         user = User.objects.get(email=email)
         self.shared_with.add(user)
 
+    def add_many(self, emails, create_missing=False):
+        # One IN query to resolve the sharees and one INSERT for the links,
+        # however many there are. Returns the emails shared with and the ones
+        # that weren't (no such user, or invalid when creating).
+        User = get_user_model()
+        emails = list(dict.fromkeys(email.strip() for email in emails if email.strip()))
+        with transaction.atomic():
+            found = set(
+                User.objects.filter(email__in=emails).values_list("email", flat=True)
+            )
+            missing = [email for email in emails if email not in found]
+            if create_missing:
+                valid = [email for email in missing if is_valid_email(email)]
+                User.objects.bulk_create(
+                    [User(email=email) for email in valid], ignore_conflicts=True
+                )
+                found.update(valid)
+                missing = [email for email in missing if email not in found]
+            # bulk_create skips m2m_changed, so touch the list ourselves.
+            Sharing = List.shared_with.through
+            Sharing.objects.bulk_create(
+                [
+                    Sharing(list_id=self.id, user_id=email)
+                    for email in emails
+                    if email in found
+                ],
+                ignore_conflicts=True,
+            )
+            if found:
+                List.objects.filter(id=self.id).touch()
+        return [email for email in emails if email in found], missing
+
+    def add_items(self, texts):
+        errors = {}
+        pending = {}
+        for index, text in enumerate(texts):
+            text = text.strip()
+            if not text:
+                errors[index] = EMPTY_ITEM_ERROR
+            elif text in pending:
+                errors[index] = DUPLICATE_ITEM_ERROR
+            else:
+                pending[text] = index
+
+        batch_texts = list(pending)
+        with transaction.atomic():
+            position = self.item_set.aggregate(last=models.Max("position"))["last"] or 0
+            for start in range(0, len(batch_texts), BULK_ADD_BATCH_SIZE):
+                batch = batch_texts[start : start + BULK_ADD_BATCH_SIZE]
+                existing = set(
+                    self.item_set.filter(text__in=batch).values_list("text", flat=True)
+                )
+                for text in existing:
+                    errors[pending.pop(text)] = DUPLICATE_ITEM_ERROR
+                new_items = [
+                    Item(list=self, text=text, position=position + n)
+                    for n, text in enumerate(
+                        (text for text in batch if text not in existing), 1
+                    )
+                ]
+                Item.objects.bulk_create(new_items, ignore_conflicts=True)
+                position += len(new_items)
+        if pending:
+            List.objects.filter(id=self.id).touch()
+        return dict(sorted(errors.items()))
+
+    def rebalance(self):
+        # Spreads the positions back out to 1, 2, 3... in the current order.
+        # Rewrites the whole list, so it runs from rebalance_item_positions
+        # rather than during a move.
+        with transaction.atomic():
+            positions = self.item_set.values_list("id", "position")
+            moved = [
+                (new_position, item_id)
+                for new_position, (item_id, position) in enumerate(positions, 1)
+                if position != new_position
+            ]
+            # Per-row UPDATEs in one executemany. bulk_update's CASE
+            # statements took about 15s for 100k items, whatever the batch
+            # size; this takes under half a second.
+            quote_name = connection.ops.quote_name
+            meta = Item._meta
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f"UPDATE {quote_name(meta.db_table)}"
+                    f" SET {quote_name(meta.get_field('position').column)} = %s"
+                    f" WHERE {quote_name(meta.pk.column)} = %s",
+                    moved,
+                )
+            List.objects.filter(id=self.id).update(needs_rebalance=False)
+        return len(moved)
+
     @property
     def name(self):
+        if hasattr(self, "first_item_text"):
+            return self.first_item_text
         return self.item_set.first().text
 
 
+def position_between(lower, upper):
+    if lower is None:
+        return 1.0 if upper is None else upper - 1
+    if upper is None:
+        return lower + 1
+    return (lower + upper) / 2
+
+
+def append_positions(items):
+    # Puts items that have no position yet at the end of their lists, in the
+    # order given. Appends that race can end up sharing a position; the id
+    # breaks the tie until a move or rebalance spreads them out.
+    unplaced = [item for item in items if item.position is None]
+    if not unplaced:
+        return
+    last = dict(
+        Item.objects.filter(list_id__in={item.list_id for item in unplaced})
+        .order_by()
+        .values("list_id")
+        .annotate(last=models.Max("position"))
+        .values_list("list_id", "last")
+    )
+    for item in unplaced:
+        item.position = last[item.list_id] = (last.get(item.list_id) or 0) + 1
+
+
+class ItemQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        append_positions(objs)
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 class Item(models.Model):
     text = models.TextField(default="")
-    list = models.ForeignKey(List, default=None, on_delete=models.CASCADE)
+    list = models.ForeignKey(
+        List, default=None, on_delete=models.CASCADE, db_index=False
+    )
+    # Left blank, saving appends the item to the end of its list.
+    position = models.FloatField(blank=True)
+
+    objects = ItemQuerySet.as_manager()
 
     class Meta:
-        ordering = ("id",)
+        ordering = ("position", "id")
         unique_together = ("list", "text")
+        # Every item read filters on the list and orders (or pages) by
+        # position; SQLite appends the rowid, which breaks any ties.
+        indexes = [
+            models.Index(fields=["list", "position"], name="lists_item_list_position")
+        ]
 
     def __str__(self):
         return self.text
+
+    def save(self, *args, **kwargs):
+        if not (self._state.adding and self.position is None):
+            return super().save(*args, **kwargs)
+        # Work the position out inside the INSERT, so adding an item is
+        # still a single statement.
+        last = (
+            Item.objects.filter(list_id=self.list_id)
+            .order_by()
+            .values("list_id")
+            .annotate(last=models.Max("position"))
+            .values("last")
+        )
+        self.position = Coalesce(models.Subquery(last), 0.0) + 1
+        try:
+            super().save(*args, **kwargs)
+        except Exception:
+            self.position = None
+            raise
+        # Don't keep an expression a later save would run again; the stored
+        # value loads like any deferred field if it's ever read.
+        del self.__dict__["position"]
+
+    def move(self, after_id=None):
+        # Puts the item straight after another one in its list, or first.
+        # Normally only this row changes: it takes a position between its
+        # new neighbours, and the list is flagged once that gap gets small.
+        siblings = Item.objects.filter(list_id=self.list_id).exclude(id=self.id)
+        with transaction.atomic():
+            lower = None
+            if after_id is not None:
+                lower = siblings.values_list("position", flat=True).get(id=after_id)
+                # Not an OR, so SQLite can seek to the position in the index.
+                siblings = siblings.filter(position__gte=lower).exclude(
+                    position=lower, id__lte=after_id
+                )
+            next_item = siblings.values_list("position", "id").first()
+            upper, upper_id = next_item or (None, None)
+            position = position_between(lower, upper)
+            flags = {}
+            if lower is not None and upper is not None:
+                if not lower < position < upper:
+                    # No room: a tie, or out of precision before a rebalance
+                    # got to it. Sitting level with the item before leaves
+                    # the order to the id, which only works if ours falls
+                    # between the neighbours'; then the respacing can wait
+                    # for rebalance_item_positions. Otherwise respace now.
+                    if not (
+                        after_id < self.id and (lower < upper or self.id < upper_id)
+                    ):
+                        self.list.rebalance()
+                        return self.move(after_id)
+                    position = lower
+                if upper - lower < MIN_POSITION_GAP:
+                    flags["needs_rebalance"] = True
+            Item.objects.filter(id=self.id).update(position=position)
+            # A move has to touch the list anyway, so set the flag there.
+            List.objects.filter(id=self.list_id).touch(**flags)
+        self.position = position
@@ -0,0 +1,56 @@
+import functools
+
+from django.db import connection
+
+from lists.models import Item, List
+
+SEARCH_RESULTS_PER_PAGE = 20
+# Any further and the OFFSET no longer fits in a 64-bit database integer.
+MAX_SEARCH_PAGE = (2**63 - 1) // SEARCH_RESULTS_PER_PAGE
+
+
+@functools.cache
+def search_index_available():
+    # Created by migration 0010 on SQLite builds with FTS5.
+    return (
+        connection.vendor == "sqlite"
+        and "lists_item_fts" in connection.introspection.table_names()
+    )
+
+
+def fts_query(terms):
+    # Quote every term so punctuation in user input is matched literally
+    # rather than parsed as FTS5 syntax; adjacent strings are ANDed.
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def search_items(user, query, page=1):
+    # Returns one page of the user's matching items, best match first, and
+    # whether there is another page.
+    terms = query.split()
+    if not terms:
+        return [], False
+    visible_lists = List.objects.visible_to(user).values("id")
+    offset = (page - 1) * SEARCH_RESULTS_PER_PAGE
+    limit = SEARCH_RESULTS_PER_PAGE + 1
+
+    if search_index_available():
+        lists_sql, lists_params = visible_lists.query.sql_with_params()
+        items = Item.objects.raw(
+            "SELECT lists_item.* FROM lists_item_fts"
+            " JOIN lists_item ON lists_item.id = lists_item_fts.rowid"
+            " WHERE lists_item_fts MATCH %s"
+            f" AND lists_item.list_id IN ({lists_sql})"
+            " ORDER BY bm25(lists_item_fts), lists_item.id"
+            " LIMIT %s OFFSET %s",
+            [fts_query(terms), *lists_params, limit, offset],
+        )
+    else:
+        # No ranking without the index, and this scans the user's items.
+        items = Item.objects.filter(list__in=visible_lists)
+        for term in terms:
+            items = items.filter(text__icontains=term)
+        items = items.order_by("id")[offset : offset + limit]
+
+    items = list(items)
+    return items[:SEARCH_RESULTS_PER_PAGE], len(items) > SEARCH_RESULTS_PER_PAGE
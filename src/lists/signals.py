@@ -0,0 +1,23 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from lists.models import Item, List
+
+
+@receiver(post_save, sender=Item)
+@receiver(post_delete, sender=Item)
+def item_changed(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, List):
+        return
+    List.objects.filter(id=instance.list_id).touch()
+
+
+@receiver(m2m_changed, sender=List.shared_with.through)
+def sharing_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            List.objects.filter(id=instance.id).touch()
+    elif action in ("post_add", "post_remove"):
+        List.objects.filter(id__in=pk_set).touch()
+    elif action == "pre_clear":
+        instance.shared_lists.touch()
@@ -0,0 +1,87 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from lists.models import Item, List
+
+User = get_user_model()
+
+
+@override_settings(ROOT_URLCONF="superlists.async_urls")
+class AsyncHomePageTest(TestCase):
+    async def test_uses_home_template(self):
+        response = await self.async_client.get("/")
+        self.assertTemplateUsed(response, "home.html")
+
+
+@override_settings(ROOT_URLCONF="superlists.async_urls")
+class AsyncListViewTest(TestCase):
+    async def test_displays_only_items_for_that_list(self):
+        correct_list = await List.objects.acreate()
+        await Item.objects.acreate(text="itemey 1", list=correct_list)
+        await Item.objects.acreate(text="itemey 2", list=correct_list)
+        other_list = await List.objects.acreate()
+        await Item.objects.acreate(text="other list item", list=other_list)
+
+        response = await self.async_client.get(f"/lists/{correct_list.id}/")
+
+        self.assertTemplateUsed(response, "list.html")
+        self.assertContains(response, "1: itemey 1")
+        self.assertContains(response, "2: itemey 2")
+        self.assertNotContains(response, "other list item")
+
+    async def test_shows_owner_and_sharees(self):
+        owner = await User.objects.acreate(email="a@b.com")
+        friend = await User.objects.acreate(email="friend@example.com")
+        mylist = await List.objects.acreate(owner=owner)
+        await mylist.shared_with.aadd(friend)
+
+        response = await self.async_client.get(f"/lists/{mylist.id}/")
+
+        self.assertContains(response, "a@b.com")
+        self.assertContains(response, "friend@example.com")
+
+    async def test_shows_logged_in_user(self):
+        user = await User.objects.acreate(email="a@b.com")
+        await self.async_client.aforce_login(user)
+        mylist = await List.objects.acreate()
+
+        response = await self.async_client.get(f"/lists/{mylist.id}/")
+
+        self.assertContains(response, "Logged in as a@b.com")
+
+    async def test_answers_if_none_match_with_304(self):
+        mylist = await List.objects.acreate()
+        response = await self.async_client.get(f"/lists/{mylist.id}/")
+        response = await self.async_client.get(
+            f"/lists/{mylist.id}/", headers={"if-none-match": response["ETag"]}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    async def test_POST_goes_through_sync_view(self):
+        mylist = await List.objects.acreate()
+
+        response = await self.async_client.post(
+            f"/lists/{mylist.id}/", data={"text": "A new item"}
+        )
+
+        self.assertRedirects(
+            response, f"/lists/{mylist.id}/", fetch_redirect_response=False
+        )
+        self.assertEqual(await Item.objects.filter(list=mylist).acount(), 1)
+
+
+@override_settings(ROOT_URLCONF="superlists.async_urls")
+class AsyncMyListsTest(TestCase):
+    async def test_shows_owned_and_shared_lists(self):
+        owner = await User.objects.acreate(email="a@b.com")
+        owned = await List.objects.acreate(owner=owner)
+        await Item.objects.acreate(list=owned, text="mine")
+        shared = await List.objects.acreate()
+        await Item.objects.acreate(list=shared, text="shared with me")
+        await shared.shared_with.aadd(owner)
+
+        response = await self.async_client.get("/lists/users/a@b.com/")
+
+        self.assertTemplateUsed(response, "my_lists.html")
+        self.assertContains(response, "mine")
+        self.assertContains(response, "shared with me")
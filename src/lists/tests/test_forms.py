@@ -1,3 +1,6 @@
+from unittest.mock import patch
+
+from django.db import IntegrityError
 from django.test import TestCase
 from lists.forms import (
     DUPLICATE_ITEM_ERROR,
@@ -39,9 +42,37 @@ class ExistingListItemFormTest(TestCase):
         self.assertFalse(form.is_valid())
         self.assertEqual(form.errors["text"], [EMPTY_ITEM_ERROR])
 
-    def test_form_validation_for_duplicate_items(self):
+    def test_form_save_reports_duplicate_items(self):
         list_ = List.objects.create()
         Item.objects.create(list=list_, text="no twins!")
         form = ExistingListItemForm(for_list=list_, data={"text": "no twins!"})
+        self.assertTrue(form.is_valid())
+        self.assertIsNone(form.save())
         self.assertFalse(form.is_valid())
         self.assertEqual(form.errors["text"], [DUPLICATE_ITEM_ERROR])
+        self.assertEqual(Item.objects.count(), 1)
+
+    @patch(
+        "lists.forms.forms.models.ModelForm.save",
+        side_effect=IntegrityError("NOT NULL constraint failed: lists_item.text"),
+    )
+    def test_form_save_reraises_other_integrity_errors(self, mock_save):
+        list_ = List.objects.create()
+        form = ExistingListItemForm(for_list=list_, data={"text": "hi"})
+        self.assertTrue(form.is_valid())
+        with self.assertRaises(IntegrityError):
+            form.save()
+        self.assertNotIn("text", form.errors)
+
+    def test_form_save(self):
+        list_ = List.objects.create()
+        form = ExistingListItemForm(for_list=list_, data={"text": "hi"})
+        form.is_valid()
+        new_item = form.save()
+        self.assertEqual(new_item, Item.objects.get())
+
+    def test_validation_does_not_query_for_duplicates(self):
+        list_ = List.objects.create()
+        form = ExistingListItemForm(for_list=list_, data={"text": "no twins!"})
+        with self.assertNumQueries(0):
+            self.assertTrue(form.is_valid())
@@ -1,5 +1,9 @@
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
-from lists.models import Item, List
+from django.test.utils import CaptureQueriesContext
+from lists.models import DUPLICATE_ITEM_ERROR, EMPTY_ITEM_ERROR, Item, List
 from django.db.utils import IntegrityError
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
@@ -79,9 +83,199 @@ class ListModelTest(TestCase):
         Item.objects.create(list=list_, text="second item")
         self.assertEqual(list_.name, "first item")
 
+    def test_with_names_annotates_first_item_text(self):
+        list1 = List.objects.create()
+        Item.objects.create(list=list1, text="first item")
+        Item.objects.create(list=list1, text="second item")
+        list2 = List.objects.create()
+        Item.objects.create(list=list2, text="other list")
+        with self.assertNumQueries(1):
+            names = [list_.name for list_ in List.objects.with_names().order_by("id")]
+        self.assertEqual(names, ["first item", "other list"])
+
+    def test_with_names_follows_changes_to_first_item(self):
+        list_ = List.objects.create()
+        first = Item.objects.create(list=list_, text="first item")
+        Item.objects.create(list=list_, text="second item")
+        first.text = "renamed"
+        first.save()
+        self.assertEqual(List.objects.with_names().get().name, "renamed")
+        first.delete()
+        self.assertEqual(List.objects.with_names().get().name, "second item")
+
     def test_list_shared_with_add_method(self):
         user = User.objects.create(email="a@b.com")
         friend = User.objects.create(email="myfriend@example.com")
         mylist = List.objects.create(owner=user)
         mylist.add("myfriend@example.com")
         self.assertIn(friend, mylist.shared_with.all())
+
+
+class ListAddItemsTest(TestCase):
+    def test_adds_items_in_order(self):
+        mylist = List.objects.create()
+        errors = mylist.add_items(["one", "two", "three"])
+        self.assertEqual(errors, {})
+        self.assertEqual(
+            [item.text for item in mylist.item_set.all()],
+            ["one", "two", "three"],
+        )
+
+    def test_reports_empty_and_duplicate_items(self):
+        mylist = List.objects.create()
+        Item.objects.create(list=mylist, text="already there")
+        errors = mylist.add_items(["new", "", "already there", "new", "  "])
+        self.assertEqual(
+            errors,
+            {
+                1: EMPTY_ITEM_ERROR,
+                2: DUPLICATE_ITEM_ERROR,
+                3: DUPLICATE_ITEM_ERROR,
+                4: EMPTY_ITEM_ERROR,
+            },
+        )
+        self.assertEqual(
+            [item.text for item in mylist.item_set.all()],
+            ["already there", "new"],
+        )
+
+    def test_duplicates_in_other_lists_are_fine(self):
+        Item.objects.create(list=List.objects.create(), text="bla")
+        mylist = List.objects.create()
+        self.assertEqual(mylist.add_items(["bla"]), {})
+        self.assertEqual(mylist.item_set.get().text, "bla")
+
+    @mock.patch("lists.models.BULK_ADD_BATCH_SIZE", 10)
+    def test_uses_a_constant_number_of_queries_per_batch(self):
+        mylist = List.objects.create()
+        # savepoint + release, the last position, a duplicate check and an
+        # insert per batch, then bumping the list's updated_at
+        with self.assertNumQueries(2 + 1 + 2 * 3 + 1):
+            errors = mylist.add_items([f"item {i}" for i in range(25)])
+        self.assertEqual(errors, {})
+        self.assertEqual(mylist.item_set.count(), 25)
+
+
+class ListCreateWithItemTest(TestCase):
+    def test_creates_list_with_owner_and_first_item(self):
+        user = User.objects.create(email="a@b.com")
+        mylist = List.objects.create_with_item("first item", owner=user)
+        self.assertEqual(mylist.owner, user)
+        self.assertEqual(mylist.item_set.get().text, "first item")
+
+    def test_inserts_list_and_item_in_one_transaction(self):
+        # savepoint + release around the two inserts
+        with self.assertNumQueries(4):
+            List.objects.create_with_item("first item")
+
+    def test_failed_item_insert_leaves_no_empty_list(self):
+        with mock.patch.object(
+            Item.objects, "bulk_create", side_effect=IntegrityError
+        ):
+            with self.assertRaises(IntegrityError):
+                List.objects.create_with_item("first item")
+        self.assertEqual(List.objects.count(), 0)
+
+
+class ListAddManyTest(TestCase):
+    def test_shares_with_known_users_and_reports_unknown_ones(self):
+        friend = User.objects.create(email="friend@example.com")
+        mylist = List.objects.create()
+        shared, unknown = mylist.add_many(
+            ["friend@example.com", " stranger@example.com ", "friend@example.com", ""]
+        )
+        self.assertEqual(shared, ["friend@example.com"])
+        self.assertEqual(unknown, ["stranger@example.com"])
+        self.assertEqual(list(mylist.shared_with.all()), [friend])
+        self.assertFalse(User.objects.filter(email="stranger@example.com").exists())
+
+    def test_can_create_missing_users(self):
+        mylist = List.objects.create()
+        shared, unknown = mylist.add_many(
+            ["new@example.com", "not an email"], create_missing=True
+        )
+        self.assertEqual(shared, ["new@example.com"])
+        self.assertEqual(unknown, ["not an email"])
+        self.assertEqual(
+            list(mylist.shared_with.values_list("email", flat=True)),
+            ["new@example.com"],
+        )
+
+    def test_sharing_again_is_harmless(self):
+        User.objects.create(email="friend@example.com")
+        mylist = List.objects.create()
+        mylist.add("friend@example.com")
+        mylist.add_many(["friend@example.com"])
+        self.assertEqual(mylist.shared_with.count(), 1)
+
+    def test_sharing_touches_list(self):
+        User.objects.create(email="friend@example.com")
+        mylist = List.objects.create()
+        before = mylist.updated_at
+        mylist.add_many(["friend@example.com"])
+        mylist.refresh_from_db()
+        self.assertGreater(mylist.updated_at, before)
+
+    def test_query_count_for_a_thousand_sharees(self):
+        emails = [f"friend{i}@example.com" for i in range(1000)]
+        User.objects.bulk_create(User(email=email) for email in emails[:500])
+        mylist = List.objects.create()
+        # savepoint + release, one IN lookup, the users and links inserted in
+        # SQLite-sized batches (999 parameters), then the updated_at bump
+        with self.assertNumQueries(2 + 1 + 1 + 3 + 1):
+            shared, unknown = mylist.add_many(emails, create_missing=True)
+        self.assertEqual(len(shared), 1000)
+        self.assertEqual(unknown, [])
+        self.assertEqual(mylist.shared_with.count(), 1000)
+
+
+class ListUpdatedAtTest(TestCase):
+    def assertTouches(self, list_, fn):
+        list_.refresh_from_db()
+        before = list_.updated_at
+        fn()
+        list_.refresh_from_db()
+        self.assertGreater(list_.updated_at, before)
+
+    def test_saving_an_item_touches_list(self):
+        mylist = List.objects.create()
+        self.assertTouches(
+            mylist, lambda: Item.objects.create(list=mylist, text="new item")
+        )
+
+    def test_deleting_an_item_touches_list(self):
+        mylist = List.objects.create()
+        item = Item.objects.create(list=mylist, text="doomed")
+        self.assertTouches(mylist, item.delete)
+
+    def test_add_items_touches_list(self):
+        mylist = List.objects.create()
+        self.assertTouches(mylist, lambda: mylist.add_items(["one", "two"]))
+
+    def test_sharing_touches_list(self):
+        User.objects.create(email="friend@example.com")
+        mylist = List.objects.create()
+        self.assertTouches(mylist, lambda: mylist.add("friend@example.com"))
+
+    def test_sharing_from_the_user_side_touches_list(self):
+        friend = User.objects.create(email="friend@example.com")
+        mylist = List.objects.create()
+        self.assertTouches(mylist, lambda: friend.shared_lists.add(mylist))
+        self.assertTouches(mylist, friend.shared_lists.clear)
+
+    def test_other_lists_are_left_alone(self):
+        mylist = List.objects.create()
+        other_list = List.objects.create()
+        before = other_list.updated_at
+        Item.objects.create(list=mylist, text="new item")
+        other_list.refresh_from_db()
+        self.assertEqual(other_list.updated_at, before)
+
+    def test_deleting_a_list_does_not_touch_it_per_item(self):
+        mylist = List.objects.create()
+        mylist.add_items([f"item {i}" for i in range(10)])
+        with CaptureQueriesContext(connection) as queries:
+            mylist.delete()
+        self.assertFalse(
+            [q for q in queries if q["sql"].startswith("UPDATE")]
+        )
@@ -0,0 +1,123 @@
+import math
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from lists.models import MIN_POSITION_GAP, Item, List
+
+
+def texts(our_list):
+    return list(our_list.item_set.values_list("text", flat=True))
+
+
+class ItemPositionTest(TestCase):
+    def setUp(self):
+        self.list = List.objects.create()
+        self.a, self.b, self.c = (
+            Item.objects.create(list=self.list, text=text) for text in "abc"
+        )
+
+    def test_new_items_are_appended(self):
+        self.assertEqual([self.a.position, self.b.position, self.c.position], [1, 2, 3])
+        Item.objects.bulk_create([Item(list=self.list, text="d"), Item(list=self.list, text="e")])
+        self.list.add_items(["f"])
+        self.assertEqual(texts(self.list), ["a", "b", "c", "d", "e", "f"])
+        self.assertEqual(self.list.item_set.last().position, 6)
+
+    def test_move_after_another_item(self):
+        self.c.move(after_id=self.a.id)
+        self.assertEqual(texts(self.list), ["a", "c", "b"])
+        self.assertEqual(self.c.position, 1.5)
+
+    def test_move_to_top_and_bottom(self):
+        self.c.move()
+        self.assertEqual(texts(self.list), ["c", "a", "b"])
+        self.c.move(after_id=self.b.id)
+        self.assertEqual(texts(self.list), ["a", "b", "c"])
+
+    def test_move_only_writes_the_item_and_the_list(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.a.move(after_id=self.b.id)
+        updates = [q["sql"] for q in queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 2)
+        self.assertIn(f'WHERE "lists_item"."id" = {self.a.id}', updates[0])
+        self.assertIn('UPDATE "lists_list"', updates[1])
+
+    def test_move_touches_the_list(self):
+        before = List.objects.get().updated_at
+        self.c.move()
+        self.assertGreater(List.objects.get().updated_at, before)
+
+    def test_cannot_move_after_an_item_in_another_list(self):
+        other = List.objects.create_with_item("elsewhere")
+        with self.assertRaises(Item.DoesNotExist):
+            self.a.move(after_id=other.item_set.get().id)
+
+    def test_narrow_gap_flags_list_for_rebalance(self):
+        moving = [self.b, self.c]
+        while not List.objects.get().needs_rebalance:
+            moving[0].move(after_id=self.a.id)
+            moving.reverse()
+        gap = self.list.item_set.all()[2].position - self.a.position
+        self.assertLess(gap, MIN_POSITION_GAP * 2)
+
+        out = StringIO()
+        call_command("rebalance_item_positions", stdout=out)
+
+        self.assertIn("Rebalanced 1 lists", out.getvalue())
+        self.assertFalse(List.objects.get().needs_rebalance)
+        self.assertEqual(
+            list(self.list.item_set.values_list("position", flat=True)), [1, 2, 3]
+        )
+
+    def test_rebalance_keeps_order(self):
+        self.a.move(after_id=self.c.id)
+        self.b.move(after_id=self.a.id)
+        self.list.rebalance()
+        self.assertEqual(
+            list(self.list.item_set.values_list("text", "position")),
+            [("c", 1), ("a", 2), ("b", 3)],
+        )
+
+    def assertMoveWithoutRoomIsDeferred(self, item, after, expected):
+        with CaptureQueriesContext(connection) as queries:
+            item.move(after_id=after.id)
+        updates = [q["sql"] for q in queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(Item.objects.get(id=item.id).position, after.position)
+        self.assertTrue(List.objects.get().needs_rebalance)
+        self.assertEqual(texts(self.list), expected)
+
+    def test_move_between_tied_items_is_placed_and_flagged(self):
+        Item.objects.filter(id__in=[self.a.id, self.c.id]).update(position=1)
+        self.a.refresh_from_db()
+        self.assertMoveWithoutRoomIsDeferred(
+            self.b, after=self.a, expected=["a", "b", "c"]
+        )
+
+    def test_move_into_gap_too_small_for_a_float_is_placed_and_flagged(self):
+        Item.objects.filter(id=self.b.id).update(position=math.nextafter(1, 2))
+        self.assertMoveWithoutRoomIsDeferred(
+            self.c, after=self.a, expected=["a", "c", "b"]
+        )
+        call_command("rebalance_item_positions", stdout=StringIO())
+        self.assertEqual(
+            list(self.list.item_set.values_list("position", flat=True)), [1, 2, 3]
+        )
+
+    def test_move_next_to_tied_items_out_of_id_order_respaces_first(self):
+        Item.objects.filter(id__in=[self.a.id, self.b.id]).update(position=1)
+        self.c.move(after_id=self.a.id)
+        self.assertEqual(texts(self.list), ["a", "c", "b"])
+        self.assertEqual(
+            list(self.list.item_set.values_list("position", flat=True)), [1, 1.5, 2]
+        )
+        self.assertFalse(List.objects.get().needs_rebalance)
+
+    def test_move_into_gap_too_small_out_of_id_order_respaces_first(self):
+        Item.objects.filter(id=self.c.id).update(position=math.nextafter(2, 3))
+        self.a.move(after_id=self.b.id)
+        self.assertEqual(texts(self.list), ["b", "a", "c"])
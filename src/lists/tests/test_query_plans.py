@@ -0,0 +1,58 @@
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from lists.models import Item, List
+
+User = get_user_model()
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite's")
+class QueryPlanTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="a@b.com")
+        friend = User.objects.create(email="friend@example.com")
+        self.list = List.objects.create(owner=self.user)
+        self.items = [
+            Item.objects.create(list=self.list, text=f"item {i}") for i in range(3)
+        ]
+        self.list.shared_with.add(friend)
+        shared = List.objects.create(owner=friend)
+        Item.objects.create(list=shared, text="shared item")
+        shared.shared_with.add(self.user)
+        self.client.force_login(self.user)
+
+    def assertNoFullScans(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        selects = [q["sql"] for q in queries if q["sql"].startswith("SELECT")]
+        self.assertTrue(selects)
+        for sql in selects:
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                plan = [row[3] for row in cursor.fetchall()]
+            # FTS5 reports its MATCH lookup as a scan of the virtual table.
+            scans = [
+                step for step in plan
+                if step.startswith("SCAN") and "VIRTUAL TABLE" not in step
+            ]
+            self.assertEqual(scans, [], f"{sql}\n" + "\n".join(plan))
+
+    def test_view_list(self):
+        self.assertNoFullScans(f"/lists/{self.list.id}/")
+
+    def test_view_list_later_page(self):
+        self.assertNoFullScans(f"/lists/{self.list.id}/?after={self.items[0].id}")
+
+    def test_view_list_after_moves(self):
+        self.items[2].move()
+        self.assertNoFullScans(f"/lists/{self.list.id}/?after={self.items[2].id}")
+
+    def test_my_lists(self):
+        self.assertNoFullScans("/lists/users/a@b.com/")
+
+    def test_search(self):
+        self.assertNoFullScans("/lists/search?q=item")
@@ -0,0 +1,154 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+
+from lists.models import Item, List
+from lists.search import search_index_available, search_items
+
+User = get_user_model()
+
+
+class SearchItemsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="a@b.com")
+        self.list = List.objects.create(owner=self.user)
+
+    def texts(self, query, **kwargs):
+        items, _ = search_items(self.user, query, **kwargs)
+        return [item.text for item in items]
+
+    def test_uses_the_fts_index_on_sqlite(self):
+        self.assertTrue(search_index_available())
+
+    def test_finds_items_in_owned_and_shared_lists_only(self):
+        shared = List.objects.create()
+        shared.shared_with.add(self.user)
+        Item.objects.create(list=self.list, text="buy milk")
+        Item.objects.create(list=shared, text="milk the cow")
+        Item.objects.create(list=List.objects.create(), text="someone else's milk")
+        self.assertCountEqual(self.texts("milk"), ["buy milk", "milk the cow"])
+
+    def test_all_terms_must_match(self):
+        Item.objects.create(list=self.list, text="buy milk")
+        Item.objects.create(list=self.list, text="buy eggs")
+        self.assertEqual(self.texts("buy eggs"), ["buy eggs"])
+
+    def test_ranks_closer_matches_first(self):
+        Item.objects.create(list=self.list, text="milk and eggs and bread and jam")
+        Item.objects.create(list=self.list, text="milk")
+        self.assertEqual(self.texts("milk"), ["milk", "milk and eggs and bread and jam"])
+
+    def test_index_follows_updates_deletes_and_bulk_inserts(self):
+        item = Item.objects.create(list=self.list, text="buy milk")
+        item.text = "buy oat milk"
+        item.save()
+        self.assertEqual(self.texts("oat"), ["buy oat milk"])
+        item.delete()
+        self.assertEqual(self.texts("milk"), [])
+        Item.objects.bulk_create(
+            [Item(list=self.list, text=f"bulk item {i}") for i in range(3)]
+        )
+        self.assertEqual(len(self.texts("bulk")), 3)
+
+    def test_fts_syntax_in_queries_is_matched_literally(self):
+        Item.objects.create(list=self.list, text='say "hello" OR goodbye')
+        self.assertEqual(self.texts('"hello" OR ('), ['say "hello" OR goodbye'])
+        self.assertEqual(self.texts("NEAR(x"), [])
+
+    def test_blank_query_finds_nothing(self):
+        Item.objects.create(list=self.list, text="buy milk")
+        self.assertEqual(search_items(self.user, "  "), ([], False))
+
+    @mock.patch("lists.search.SEARCH_RESULTS_PER_PAGE", 2)
+    def test_paginates_results(self):
+        Item.objects.bulk_create(
+            [Item(list=self.list, text=f"item {i}") for i in range(5)]
+        )
+        first, has_next = search_items(self.user, "item")
+        self.assertEqual(len(first), 2)
+        self.assertTrue(has_next)
+        last, has_next = search_items(self.user, "item", page=3)
+        self.assertEqual(len(last), 1)
+        self.assertFalse(has_next)
+        seen = first + search_items(self.user, "item", page=2)[0] + last
+        self.assertEqual(len({item.id for item in seen}), 5)
+
+    @mock.patch("lists.search.search_index_available", return_value=False)
+    def test_falls_back_to_icontains_without_the_index(self, _):
+        Item.objects.create(list=self.list, text="Buy Milk")
+        Item.objects.create(list=List.objects.create(), text="buy milk")
+        self.assertEqual(self.texts("milk buy"), ["Buy Milk"])
+
+
+class SearchViewTest(TestCase):
+    def test_redirects_anonymous_users_home(self):
+        response = self.client.get("/lists/search?q=milk")
+        self.assertRedirects(response, "/")
+
+    def test_renders_matching_items_with_links_to_their_lists(self):
+        user = User.objects.create(email="a@b.com")
+        mylist = List.objects.create(owner=user)
+        Item.objects.create(list=mylist, text="buy milk")
+        self.client.force_login(user)
+        response = self.client.get("/lists/search?q=milk")
+        self.assertTemplateUsed(response, "search.html")
+        self.assertContains(response, f'<a href="/lists/{mylist.id}/">buy milk</a>')
+
+    @mock.patch("lists.search.SEARCH_RESULTS_PER_PAGE", 1)
+    def test_links_to_next_page(self):
+        user = User.objects.create(email="a@b.com")
+        mylist = List.objects.create(owner=user)
+        Item.objects.create(list=mylist, text="buy milk")
+        Item.objects.create(list=mylist, text="more milk")
+        self.client.force_login(user)
+        response = self.client.get("/lists/search?q=milk")
+        self.assertContains(response, "?q=milk&amp;page=2")
+        response = self.client.get("/lists/search?q=milk&page=2")
+        self.assertEqual(response.context["next_page"], None)
+
+    def test_treats_out_of_range_page_as_the_first(self):
+        user = User.objects.create(email="a@b.com")
+        mylist = List.objects.create(owner=user)
+        Item.objects.create(list=mylist, text="buy milk")
+        self.client.force_login(user)
+        response = self.client.get("/lists/search?q=milk&page=99999999999999999999")
+        self.assertContains(response, "buy milk")
+
+
+class SearchIndexMigrationTest(TransactionTestCase):
+    # Later migrations on lists_item must not rebuild the table, which would
+    # silently drop the triggers that keep the index in sync.
+
+    def migrate(self, target):
+        executor = MigrationExecutor(connection)
+        executor.migrate([target])
+
+    def latest_migration(self):
+        return MigrationExecutor(connection).loader.graph.leaf_nodes("lists")[0]
+
+    def trigger_names(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master"
+                " WHERE type = 'trigger' AND tbl_name = 'lists_item'"
+            )
+            return {name for name, in cursor.fetchall()}
+
+    def test_search_still_follows_writes_after_rolling_back_and_forward(self):
+        triggers = self.trigger_names()
+        self.assertEqual(len(triggers), 3)
+        latest = self.latest_migration()
+        self.addCleanup(self.migrate, latest)
+
+        self.migrate(("lists", "0011_access_path_indexes"))
+        self.assertEqual(self.trigger_names(), triggers)
+        self.migrate(latest)
+
+        self.assertEqual(self.trigger_names(), triggers)
+        user = User.objects.create(email="a@b.com")
+        Item.objects.create(list=List.objects.create(owner=user), text="buy milk")
+        items, _ = search_items(user, "milk")
+        self.assertEqual([item.text for item in items], ["buy milk"])
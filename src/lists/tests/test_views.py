@@ -1,4 +1,12 @@
-from django.test import TestCase
+import json
+import re
+import threading
+import time
+
+from django.db import connection
+from django.db.utils import IntegrityError
+from django.test import TestCase, TransactionTestCase
+from unittest import mock
 from lists.models import Item, List
 from lists.forms import (
     ItemForm,
@@ -7,6 +15,7 @@ from lists.forms import (
     ExistingListItemForm,
 )
 from django.utils.html import escape
+from django.utils.http import http_date
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -76,6 +85,13 @@ class ListViewTest(TestCase):
 
         self.assertRedirects(response, f"/lists/{correct_list.id}/")
 
+    def test_POST_inserts_without_checking_for_duplicates_first(self):
+        mylist = List.objects.create()
+        # list lookup, then savepoint, insert, updated_at bump and release
+        with self.assertNumQueries(5):
+            self.client.post(f"/lists/{mylist.id}/", data={"text": "new item"})
+        self.assertEqual(mylist.item_set.get().text, "new item")
+
     def post_invalid_input(self):
         mylist = List.objects.create()
         return self.client.post(
@@ -119,6 +135,113 @@ class ListViewTest(TestCase):
         self.assertIsInstance(response.context["form"], ExistingListItemForm)
         self.assertContains(response, 'name="text"')
 
+    @mock.patch("lists.views.ITEMS_PER_PAGE", 2)
+    def test_paginates_items_with_after_cursor(self):
+        mylist = List.objects.create()
+        items = [Item.objects.create(list=mylist, text=f"item {i}") for i in range(5)]
+
+        response = self.client.get(f"/lists/{mylist.id}/")
+        self.assertEqual(response.context["items"], items[:2])
+        self.assertEqual(response.context["next_after"], items[1].id)
+        self.assertContains(response, f"?after={items[1].id}")
+
+        response = self.client.get(f"/lists/{mylist.id}/?after={items[1].id}")
+        self.assertEqual(response.context["items"], items[2:4])
+
+        response = self.client.get(f"/lists/{mylist.id}/?after={items[3].id}")
+        self.assertEqual(response.context["items"], items[4:])
+        self.assertIsNone(response.context["next_after"])
+
+    @mock.patch("lists.views.ITEMS_PER_PAGE", 2)
+    def test_item_numbering_continues_across_pages(self):
+        mylist = List.objects.create()
+        items = [Item.objects.create(list=mylist, text=f"item {i}") for i in range(5)]
+        response = self.client.get(f"/lists/{mylist.id}/?after={items[1].id}&start=2")
+        self.assertContains(response, "3: item 2")
+        self.assertContains(response, "4: item 3")
+        self.assertNotContains(response, "1: item 0")
+        self.assertContains(response, f"?after={items[3].id}&amp;start=4")
+
+    @mock.patch("lists.views.ITEMS_PER_PAGE", 2)
+    def test_next_page_link_carries_starting_number(self):
+        mylist = List.objects.create()
+        Item.objects.bulk_create(Item(list=mylist, text=f"item {i}") for i in range(5))
+        response = self.client.get(f"/lists/{mylist.id}/")
+        for expected in ("3: item 2", "5: item 4"):
+            next_url = re.search(
+                r'id="id_next_page"[^>]* href="([^"]+)"', response.content.decode()
+            )
+            response = self.client.get(next_url[1].replace("&amp;", "&"))
+            self.assertContains(response, expected)
+
+    @mock.patch("lists.views.ITEMS_PER_PAGE", 2)
+    def test_page_query_count_does_not_grow_with_list_size(self):
+        mylist = List.objects.create()
+        Item.objects.bulk_create(
+            Item(list=mylist, text=f"item {i}") for i in range(50)
+        )
+        after = Item.objects.all()[20].id
+        # list, page of items, sharees; nothing counts the earlier items
+        with self.assertNumQueries(3):
+            response = self.client.get(f"/lists/{mylist.id}/?after={after}&start=21")
+        self.assertEqual(len(response.context["items"]), 2)
+
+    @mock.patch("lists.views.ITEMS_PER_PAGE", 2)
+    def test_pages_follow_item_positions(self):
+        mylist = List.objects.create()
+        items = [Item.objects.create(list=mylist, text=f"item {i}") for i in range(5)]
+        items[4].move()
+        Item.objects.filter(id=items[1].id).update(position=items[0].position)
+        response = self.client.get(f"/lists/{mylist.id}/?after={items[4].id}")
+        self.assertEqual(response.context["items"], items[:2])
+        response = self.client.get(f"/lists/{mylist.id}/?after={items[1].id}&start=3")
+        self.assertEqual(response.context["items"], items[2:4])
+        self.assertContains(response, "4: item 2")
+
+    def test_repeat_views_of_unchanged_list_use_cached_fragments(self):
+        friend = User.objects.create(email="friend@example.com")
+        mylist = List.objects.create(owner=User.objects.create(email="a@b.com"))
+        Item.objects.create(list=mylist, text="itemey 1")
+        mylist.shared_with.add(friend)
+        self.client.get(f"/lists/{mylist.id}/")
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/lists/{mylist.id}/")
+
+        self.assertTemplateNotUsed(response, "list_items.html")
+        self.assertContains(response, "1: itemey 1")
+        self.assertContains(response, "friend@example.com")
+        self.assertContains(response, "a@b.com")
+
+    def test_new_items_invalidate_cached_fragments(self):
+        mylist = List.objects.create()
+        Item.objects.create(list=mylist, text="itemey 1")
+        self.client.get(f"/lists/{mylist.id}/")
+
+        self.client.post(f"/lists/{mylist.id}/", data={"text": "itemey 2"})
+        response = self.client.get(f"/lists/{mylist.id}/")
+
+        self.assertTemplateUsed(response, "list_items.html")
+        self.assertContains(response, "2: itemey 2")
+
+    def test_sharing_invalidates_cached_fragments(self):
+        User.objects.create(email="friend@example.com")
+        mylist = List.objects.create()
+        self.client.get(f"/lists/{mylist.id}/")
+
+        self.client.post(
+            f"/lists/{mylist.id}/share", data={"sharee": "friend@example.com"}
+        )
+        response = self.client.get(f"/lists/{mylist.id}/")
+
+        self.assertContains(response, "friend@example.com")
+
+    def test_ignores_invalid_after_cursor(self):
+        mylist = List.objects.create()
+        Item.objects.create(list=mylist, text="itemey")
+        response = self.client.get(f"/lists/{mylist.id}/?after=nope")
+        self.assertContains(response, "1: itemey")
+
     def test_form_save(self):
         mylist = List.objects.create()
         form = ExistingListItemForm(for_list=mylist, data={"text": "hi"})
@@ -126,6 +249,37 @@ class ListViewTest(TestCase):
         self.assertEqual(new_item, Item.objects.all()[0])
 
 
+class AddItemsTest(TestCase):
+    def test_adds_items_and_reports_errors_as_json(self):
+        mylist = List.objects.create()
+        Item.objects.create(list=mylist, text="old")
+
+        response = self.client.post(
+            f"/lists/{mylist.id}/items",
+            data={"items": ["new 1", "", "old", "new 2"]},
+        )
+
+        self.assertEqual(
+            response.json(),
+            {
+                "added": 2,
+                "errors": [
+                    {"index": 1, "text": "", "error": EMPTY_ITEM_ERROR},
+                    {"index": 2, "text": "old", "error": DUPLICATE_ITEM_ERROR},
+                ],
+            },
+        )
+        self.assertEqual(
+            [item.text for item in mylist.item_set.all()],
+            ["old", "new 1", "new 2"],
+        )
+
+    def test_only_accepts_POST(self):
+        mylist = List.objects.create()
+        response = self.client.get(f"/lists/{mylist.id}/items")
+        self.assertEqual(response.status_code, 405)
+
+
 class NewListTest(TestCase):
     def test_can_save_a_post_request(self):
         self.client.post("/lists/new", data={"text": "A new list item"})
@@ -151,6 +305,41 @@ class NewListTest(TestCase):
         self.assertEqual(Item.objects.count(), 0)
 
 
+class NewListConcurrencyTest(TransactionTestCase):
+    def test_concurrent_posts_with_failures_leave_no_orphan_lists(self):
+        bulk_create = Item.objects.bulk_create
+        created = []
+
+        def flaky_bulk_create(items, *args, **kwargs):
+            if items[0].text.startswith("fail"):
+                raise IntegrityError("injected")
+            return bulk_create(items, *args, **kwargs)
+
+        def post(text):
+            # Failed requests come back as 500s: the in-memory test database
+            # also fails some writers with "table is locked". Whatever the
+            # failure, it must not leave a list behind.
+            client = self.client_class(raise_request_exception=False)
+            response = client.post("/lists/new", data={"text": text})
+            created.append(response.status_code == 302)
+            connection.close()
+
+        texts = [f"{'fail' if i % 3 == 0 else 'item'} {i}" for i in range(12)]
+        threads = [threading.Thread(target=post, args=(text,)) for text in texts]
+        with (
+            mock.patch.object(Item.objects, "bulk_create", flaky_bulk_create),
+            self.assertLogs("django.request", "ERROR"),
+        ):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(List.objects.count(), sum(created))
+        self.assertFalse(List.objects.filter(item__isnull=True).exists())
+        self.assertFalse(Item.objects.filter(text__startswith="fail").exists())
+
+
 class MyListsTest(TestCase):
     def test_my_lists_url_renders_my_lists_template(self):
         User.objects.create(email="a@b.com")
@@ -163,6 +352,21 @@ class MyListsTest(TestCase):
         response = self.client.get("/lists/users/a@b.com/")
         self.assertEqual(response.context["owner"], correct_user)
 
+    def test_my_lists_query_count_does_not_grow_with_number_of_lists(self):
+        owner = User.objects.create(email="a@b.com")
+        for i in range(20):
+            owned = List.objects.create(owner=owner)
+            Item.objects.create(list=owned, text=f"owned {i}")
+            shared = List.objects.create()
+            Item.objects.create(list=shared, text=f"shared {i}")
+            shared.shared_with.add(owner)
+
+        with self.assertNumQueries(4):
+            response = self.client.get("/lists/users/a@b.com/")
+
+        self.assertContains(response, "owned 19")
+        self.assertContains(response, "shared 19")
+
     def test_list_owner_is_saved_if_user_is_authenticated(self):
         user = User.objects.create(email="a@b.com")
         self.client.force_login(user)
@@ -189,3 +393,291 @@ class ShareListTest(TestCase):
             data={"sharee": "myfriend@example.com"}
         )
         self.assertIn(friend, mylist.shared_with.all())
+
+
+    def test_unknown_sharee_shows_error_instead_of_crashing(self):
+        mylist = List.objects.create()
+        response = self.client.post(
+            f"/lists/{mylist.id}/share",
+            data={"sharee": "stranger@example.com"},
+            follow=True,
+        )
+        self.assertContains(response, "stranger@example.com hasn&#x27;t signed up")
+        self.assertEqual(mylist.shared_with.count(), 0)
+
+
+class MoveItemTest(TestCase):
+    def setUp(self):
+        self.list = List.objects.create()
+        self.items = [
+            Item.objects.create(list=self.list, text=f"item {i}") for i in range(3)
+        ]
+
+    def move_url(self, item):
+        return f"/lists/{self.list.id}/items/{item.id}/move"
+
+    def test_moves_item_after_another(self):
+        first, second, third = self.items
+        response = self.client.post(self.move_url(third), data={"after": first.id})
+        self.assertEqual(response.json(), {"id": third.id, "position": 1.5})
+        self.assertEqual(list(self.list.item_set.all()), [first, third, second])
+
+    def test_moves_item_to_top_without_after(self):
+        first, second, third = self.items
+        self.client.post(self.move_url(second), data={"after": ""})
+        self.assertEqual(list(self.list.item_set.all()), [second, first, third])
+
+    def test_list_page_shows_new_order(self):
+        self.client.get(f"/lists/{self.list.id}/")
+        self.client.post(self.move_url(self.items[2]))
+        response = self.client.get(f"/lists/{self.list.id}/")
+        self.assertContains(response, "1: item 2")
+
+    def test_404s_for_items_of_other_lists(self):
+        other = List.objects.create_with_item("elsewhere")
+        elsewhere = other.item_set.get()
+        response = self.client.post(self.move_url(elsewhere))
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post(
+            self.move_url(self.items[0]), data={"after": elsewhere.id}
+        )
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post(self.move_url(self.items[0]), data={"after": "x"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_only_accepts_POST(self):
+        response = self.client.get(self.move_url(self.items[0]))
+        self.assertEqual(response.status_code, 405)
+
+
+class ShareListBulkTest(TestCase):
+    def test_shares_with_many_users_and_reports_unknown_ones(self):
+        User.objects.create(email="a@example.com")
+        User.objects.create(email="b@example.com")
+        mylist = List.objects.create()
+        response = self.client.post(
+            f"/lists/{mylist.id}/share/bulk",
+            data={"sharees": ["a@example.com", "b@example.com", "c@example.com"]},
+        )
+        self.assertEqual(
+            response.json(), {"shared": 2, "unknown": ["c@example.com"]}
+        )
+        self.assertEqual(mylist.shared_with.count(), 2)
+
+    def test_owner_can_create_missing_users(self):
+        owner = User.objects.create(email="owner@example.com")
+        mylist = List.objects.create(owner=owner)
+        self.client.force_login(owner)
+        response = self.client.post(
+            f"/lists/{mylist.id}/share/bulk",
+            data={"sharees": ["new@example.com"], "create_missing": "1"},
+        )
+        self.assertEqual(response.json(), {"shared": 1, "unknown": []})
+        self.assertTrue(User.objects.filter(email="new@example.com").exists())
+
+    def test_only_the_owner_can_create_missing_users(self):
+        owner = User.objects.create(email="owner@example.com")
+        owned = List.objects.create(owner=owner)
+        for mylist, user in (
+            (owned, None),
+            (owned, User.objects.create(email="someone@example.com")),
+            (List.objects.create(), None),
+        ):
+            self.client.logout()
+            if user:
+                self.client.force_login(user)
+            response = self.client.post(
+                f"/lists/{mylist.id}/share/bulk",
+                data={"sharees": ["new@example.com"], "create_missing": "1"},
+            )
+            self.assertEqual(response.status_code, 403)
+        self.assertFalse(User.objects.filter(email="new@example.com").exists())
+        self.assertEqual(owned.shared_with.count(), 0)
+
+    def test_only_accepts_POST(self):
+        mylist = List.objects.create()
+        response = self.client.get(f"/lists/{mylist.id}/share/bulk")
+        self.assertEqual(response.status_code, 405)
+
+
+class ExportListTest(TestCase):
+    def test_streams_list_items_as_csv(self):
+        mylist = List.objects.create()
+        item1 = Item.objects.create(list=mylist, text="itemey 1")
+        item2 = Item.objects.create(list=mylist, text="itemey, 2")
+        Item.objects.create(list=List.objects.create(), text="other list item")
+
+        response = self.client.get(f"/lists/{mylist.id}/export")
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(
+            b"".join(response.streaming_content).decode(),
+            "list_id,id,text\r\n"
+            f"{mylist.id},{item1.id},itemey 1\r\n"
+            f'{mylist.id},{item2.id},"itemey, 2"\r\n',
+        )
+
+    def test_streams_list_items_as_ndjson(self):
+        mylist = List.objects.create()
+        item = Item.objects.create(list=mylist, text="itemey 1")
+
+        response = self.client.get(f"/lists/{mylist.id}/export?format=ndjson")
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [{"list_id": mylist.id, "id": item.id, "text": "itemey 1"}],
+        )
+
+    def test_unknown_format_is_404(self):
+        mylist = List.objects.create()
+        response = self.client.get(f"/lists/{mylist.id}/export?format=xml")
+        self.assertEqual(response.status_code, 404)
+
+    @mock.patch("lists.views.EXPORT_CHUNK_SIZE", 2)
+    def test_reads_items_in_chunks(self):
+        mylist = List.objects.create()
+        Item.objects.bulk_create(Item(list=mylist, text=f"item {i}") for i in range(5))
+
+        response = self.client.get(f"/lists/{mylist.id}/export?format=ndjson")
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 5)
+
+    def test_exports_owned_and_shared_lists_for_a_user(self):
+        owner = User.objects.create(email="a@b.com")
+        owned = List.objects.create(owner=owner)
+        Item.objects.create(list=owned, text="mine")
+        shared = List.objects.create()
+        shared.shared_with.add(owner)
+        Item.objects.create(list=shared, text="shared with me")
+        Item.objects.create(list=List.objects.create(), text="not mine")
+
+        response = self.client.get("/lists/users/a@b.com/export?format=ndjson")
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            [json.loads(line)["text"] for line in lines],
+            ["mine", "shared with me"],
+        )
+
+
+class ConditionalGetTest(TestCase):
+    def get_validators(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def test_view_list_answers_if_none_match_with_304_in_one_query(self):
+        mylist = List.objects.create()
+        Item.objects.create(list=mylist, text="itemey 1")
+        etag = self.get_validators(f"/lists/{mylist.id}/")
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                f"/lists/{mylist.id}/", headers={"if-none-match": etag}
+            )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_view_list_shows_share_error_to_a_revalidating_browser(self):
+        mylist = List.objects.create()
+        etag = self.get_validators(f"/lists/{mylist.id}/")
+        self.client.post(
+            f"/lists/{mylist.id}/share", data={"sharee": "nobody@example.com"}
+        )
+
+        response = self.client.get(
+            f"/lists/{mylist.id}/", headers={"if-none-match": etag}
+        )
+
+        self.assertContains(response, "nobody@example.com hasn&#x27;t signed up")
+        self.assertNotIn("ETag", response)
+        # Shown once, then the page validates again.
+        etag = self.get_validators(f"/lists/{mylist.id}/")
+        response = self.client.get(
+            f"/lists/{mylist.id}/", headers={"if-none-match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def if_modified_since(self, url, when):
+        return self.client.get(url, headers={"if-modified-since": http_date(when)})
+
+    def test_pages_are_private_and_revalidated(self):
+        User.objects.create(email="a@b.com")
+        mylist = List.objects.create()
+        for url in (f"/lists/{mylist.id}/", "/lists/users/a@b.com/"):
+            response = self.client.get(url)
+            self.assertNotIn("Last-Modified", response)
+            self.assertEqual(
+                set(response["Cache-Control"].split(", ")), {"private", "no-cache"}
+            )
+            etag = self.get_validators(url)
+            response = self.client.get(url, headers={"if-none-match": etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertIn("private", response["Cache-Control"])
+
+    def test_view_list_if_modified_since_alone_does_not_hide_login(self):
+        mylist = List.objects.create()
+        self.get_validators(f"/lists/{mylist.id}/")
+        self.client.force_login(User.objects.create(email="a@b.com"))
+        response = self.if_modified_since(f"/lists/{mylist.id}/", time.time() + 60)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Logged in as a@b.com")
+
+    def test_my_lists_if_modified_since_alone_does_not_hide_deleted_list(self):
+        owner = User.objects.create(email="a@b.com")
+        List.objects.create_with_item("deleted list", owner=owner)
+        List.objects.create_with_item("kept list", owner=owner)
+        self.get_validators("/lists/users/a@b.com/")
+        List.objects.get(item__text="deleted list").delete()
+        response = self.if_modified_since("/lists/users/a@b.com/", time.time() + 60)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "deleted list")
+        self.assertContains(response, "kept list")
+
+    def test_view_list_etag_changes_when_items_change(self):
+        mylist = List.objects.create()
+        etag = self.get_validators(f"/lists/{mylist.id}/")
+        Item.objects.create(list=mylist, text="itemey 1")
+        response = self.client.get(
+            f"/lists/{mylist.id}/", headers={"if-none-match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "itemey 1")
+
+    def test_view_list_etag_changes_when_user_logs_in(self):
+        mylist = List.objects.create()
+        etag = self.get_validators(f"/lists/{mylist.id}/")
+        self.client.force_login(User.objects.create(email="a@b.com"))
+        response = self.client.get(
+            f"/lists/{mylist.id}/", headers={"if-none-match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_my_lists_answers_if_none_match_with_304_in_one_query(self):
+        owner = User.objects.create(email="a@b.com")
+        owned = List.objects.create(owner=owner)
+        Item.objects.create(list=owned, text="mine")
+        etag = self.get_validators("/lists/users/a@b.com/")
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                "/lists/users/a@b.com/", headers={"if-none-match": etag}
+            )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_my_lists_etag_changes_when_a_list_is_shared(self):
+        owner = User.objects.create(email="a@b.com")
+        etag = self.get_validators("/lists/users/a@b.com/")
+        shared = List.objects.create()
+        Item.objects.create(list=shared, text="shared with me")
+        shared.shared_with.add(owner)
+        response = self.client.get(
+            "/lists/users/a@b.com/", headers={"if-none-match": etag}
+        )
+        self.assertContains(response, "shared with me")
@@ -16,13 +16,31 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path
-from lists.views import home_page, view_list, new_list, my_lists, share_list
+from lists.views import (
+    home_page,
+    view_list,
+    new_list,
+    my_lists,
+    share_list,
+    share_list_bulk,
+    export_list,
+    export_my_lists,
+    add_items,
+    move_item,
+    search,
+)
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path("", home_page, name="home"),
     path("new", new_list, name="new_list"),
     path("<int:list_id>/", view_list, name="view_list"),
+    path("<int:list_id>/items", add_items, name="add_items"),
+    path("<int:list_id>/items/<int:item_id>/move", move_item, name="move_item"),
+    path("<int:list_id>/export", export_list, name="export_list"),
+    path("search", search, name="search"),
     path("users/<str:email>/", my_lists, name="my_lists"),
-    path("<int:list_id>/share", share_list, name="share_list")
+    path("users/<str:email>/export", export_my_lists, name="export_my_lists"),
+    path("<int:list_id>/share", share_list, name="share_list"),
+    path("<int:list_id>/share/bulk", share_list_bulk, name="share_list_bulk"),
 ]
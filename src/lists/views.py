@@ -1,4 +1,18 @@
+import csv
+import hashlib
+import json
+
+from django.conf import settings
+from django.contrib import messages
+from django.db.models import Count, Max, Subquery
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_POST
+from lists import fragments
+from lists.search import MAX_SEARCH_PAGE, search_items
 from lists.models import Item, List
 from lists.forms import ItemForm, ExistingListItemForm
 from django.contrib.auth import get_user_model
@@ -6,45 +20,312 @@ from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+ITEMS_PER_PAGE = 100
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FIELDS = ("list_id", "id", "text")
+
 # Create your views here.
 
 
+def item_page_queryset(our_list, after):
+    # Keyset pages in (position, id) order, continuing from the item `after`.
+    items = our_list.item_set.all()
+    if after is not None:
+        # Ranges rather than an OR, so SQLite can seek straight to the position.
+        position = Subquery(items.filter(id=after).values("position"))
+        items = items.filter(position__gte=position).exclude(
+            position=position, id__lte=after
+        )
+    return items[: ITEMS_PER_PAGE + 1]
+
+
+def item_page_context(page, cursor):
+    # The cursor carries the page's starting number, so numbering the items
+    # never means counting everything before them.
+    after, start = cursor
+    has_next = len(page) > ITEMS_PER_PAGE
+    return {
+        "items": page[:ITEMS_PER_PAGE],
+        "item_offset": start,
+        "next_after": page[ITEMS_PER_PAGE - 1].id if has_next else None,
+        "next_start": start + ITEMS_PER_PAGE,
+        "is_first_page": after is None,
+    }
+
+
+def get_item_page(our_list, cursor=(None, 0)):
+    page = list(item_page_queryset(our_list, cursor[0]))
+    return item_page_context(page, cursor)
+
+
+def render_fragments(our_list, item_page, sharees):
+    # The Jinja2 backend returns plain strings, so mark the fragments safe
+    # for whichever engine renders list.html.
+    return {
+        "items_fragment": mark_safe(
+            render_to_string("list_items.html", {"list": our_list, **item_page})
+        ),
+        "sharing_fragment": mark_safe(
+            render_to_string(
+                "list_sharing.html", {"list": our_list, "sharees": sharees}
+            )
+        ),
+    }
+
+
+def render_list_fragments(our_list, cursor):
+    return render_fragments(
+        our_list, get_item_page(our_list, cursor), our_list.shared_with.all()
+    )
+
+
+def parse_cursor(request):
+    # ?after=<item id>&start=<number of items before the page>
+    try:
+        after = int(request.GET["after"])
+    except (KeyError, ValueError):
+        return None, 0
+    try:
+        start = max(0, int(request.GET["start"]))
+    except (KeyError, ValueError):
+        start = 0
+    return after, start
+
+
 def home_page(request):
     return render(request, "home.html", {"form": ItemForm()})
 
 
+def make_etag(request, *parts):
+    # Pending messages (say, a failed share) only show when the page is
+    # rendered, so don't offer a validator a 304 could answer. len() doesn't
+    # mark them as seen.
+    if len(messages.get_messages(request)):
+        return None
+    # The page shows who is logged in, so tie it to the session cookie too.
+    session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME, "")
+    key = ":".join(str(part) for part in (*parts, session_key))
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def get_request_list(request, list_id):
+    if getattr(request, "list", None) is None:
+        request.list = List.objects.get(id=list_id)
+    return request.list
+
+
+def list_etag(request, list_id):
+    return make_etag(request, list_id, get_request_list(request, list_id).updated_at)
+
+
+# These pages are per user, so they're private and always revalidated. They
+# only validate by ETag: a Last-Modified date can't capture who is logged in
+# or a deleted list, and Django honours If-Modified-Since on its own when no
+# If-None-Match is sent.
+PRIVATE_PAGE = {"private": True, "no_cache": True}
+
+
+@cache_control(**PRIVATE_PAGE)
+@condition(etag_func=list_etag)
 def view_list(request, list_id):
-    our_list = List.objects.get(id=list_id)
-    form = ExistingListItemForm(for_list=our_list)
+    our_list = get_request_list(request, list_id)
+    cursor = parse_cursor(request)
     if request.method == "POST":
         form = ExistingListItemForm(for_list=our_list, data=request.POST)
-        if form.is_valid():
-            form.save()
+        if form.is_valid() and form.save():
             return redirect(our_list)
     else:
         form = ExistingListItemForm(for_list=our_list)
 
-    return render(request, "list.html", {"list": our_list, "form": form})
+    return render(
+        request,
+        "list.html",
+        {
+            "list": our_list,
+            "form": form,
+            **fragments.get_or_render(
+                our_list,
+                cursor,
+                lambda: render_list_fragments(our_list, cursor),
+            ),
+        },
+    )
 
 
 def new_list(request):
     form = ItemForm(data=request.POST)
     if form.is_valid():
-        nulist = List.objects.create()
-        if request.user.is_authenticated:
-            nulist.owner = request.user
-            nulist.save()
-        form.save(for_list=nulist)
+        nulist = List.objects.create_with_item(
+            form.cleaned_data["text"],
+            owner=request.user if request.user.is_authenticated else None,
+        )
         return redirect(nulist)
     else:
         return render(request, "home.html", {"form": form})
 
 
+@require_POST
+def add_items(request, list_id):
+    our_list = List.objects.get(id=list_id)
+    texts = request.POST.getlist("items")
+    errors = our_list.add_items(texts)
+    return JsonResponse(
+        {
+            "added": len(texts) - len(errors),
+            "errors": [
+                {"index": index, "text": texts[index], "error": error}
+                for index, error in errors.items()
+            ],
+        }
+    )
+
+
+@require_POST
+def move_item(request, list_id, item_id):
+    # Moves the item after the one posted as "after", or to the top.
+    after = request.POST.get("after")
+    try:
+        item = Item.objects.get(id=item_id, list_id=list_id)
+        item.move(int(after) if after else None)
+    except (Item.DoesNotExist, ValueError):
+        raise Http404("No such item in this list")
+    return JsonResponse({"id": item.id, "position": item.position})
+
+
+def users_lists(email):
+    return List.objects.visible_to(email)
+
+
+MY_LISTS_STATE = {"updated_at": Max("updated_at"), "count": Count("id")}
+
+
+def get_my_lists_state(request, email):
+    if getattr(request, "my_lists_state", None) is None:
+        request.my_lists_state = users_lists(email).aggregate(**MY_LISTS_STATE)
+    return request.my_lists_state
+
+
+def my_lists_etag(request, email):
+    state = get_my_lists_state(request, email)
+    return make_etag(request, email, state["updated_at"], state["count"])
+
+
+@cache_control(**PRIVATE_PAGE)
+@condition(etag_func=my_lists_etag)
 def my_lists(request, email):
     owner = User.objects.get(email=email)
-    return render(request, "my_lists.html", {"owner": owner})
+    return render(
+        request,
+        "my_lists.html",
+        {
+            "owner": owner,
+            "owned_lists": owner.lists.with_names(),
+            "shared_lists": owner.shared_lists.with_names(),
+        },
+    )
+
+def parse_page(request):
+    try:
+        page = max(1, int(request.GET["page"]))
+    except (KeyError, ValueError):
+        return 1
+    # Out of range is as meaningless as not a number.
+    return page if page <= MAX_SEARCH_PAGE else 1
+
+
+def search(request):
+    if not request.user.is_authenticated:
+        return redirect("/")
+    query = request.GET.get("q", "")
+    page = parse_page(request)
+    items, has_next = search_items(request.user, query, page)
+    return render(
+        request,
+        "search.html",
+        {
+            "query": query,
+            "items": items,
+            "page": page,
+            "next_page": page + 1 if has_next else None,
+        },
+    )
+
 
 def share_list(request, list_id):
     my_list = List.objects.get(id=list_id)
-    my_list.add(request.POST["sharee"])
+    sharee = request.POST["sharee"]
+    _, unknown = my_list.add_many([sharee])
+    if unknown:
+        messages.error(request, f"{sharee} hasn't signed up to Superlists yet")
     return redirect(my_list)
+
+
+@require_POST
+def share_list_bulk(request, list_id):
+    my_list = List.objects.get(id=list_id)
+    emails = request.POST.getlist("sharees")
+    create_missing = "create_missing" in request.POST
+    # Creating accounts is only for the list's owner, not any anonymous POST.
+    is_owner = my_list.owner_id is not None and my_list.owner_id == request.user.pk
+    if create_missing and not is_owner:
+        return JsonResponse(
+            {"error": "Only the list's owner can create accounts"}, status=403
+        )
+    shared, unknown = my_list.add_many(emails, create_missing=create_missing)
+    return JsonResponse({"shared": len(shared), "unknown": unknown})
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def csv_rows(items):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in items:
+        yield writer.writerow(row)
+
+
+def ndjson_rows(items):
+    for row in items:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row))) + "\n"
+
+
+EXPORT_FORMATS = {
+    "csv": (csv_rows, "text/csv"),
+    "ndjson": (ndjson_rows, "application/x-ndjson"),
+}
+
+
+def stream_items(request, items, filename):
+    export_format = request.GET.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        raise Http404(f"Unknown export format: {export_format}")
+    rows, content_type = EXPORT_FORMATS[export_format]
+    items = items.values_list(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    response = StreamingHttpResponse(rows(items), content_type=content_type)
+    response["Content-Disposition"] = (
+        f'attachment; filename="{filename}.{export_format}"'
+    )
+    return response
+
+
+def export_list(request, list_id):
+    our_list = List.objects.get(id=list_id)
+    return stream_items(
+        request,
+        Item.objects.filter(list=our_list),
+        f"list-{our_list.id}",
+    )
+
+
+def export_my_lists(request, email):
+    owner = User.objects.get(email=email)
+    return stream_items(
+        request,
+        Item.objects.filter(list__in=users_lists(owner.email).values("id")).order_by(
+            "list", "position", "id"
+        ),
+        "lists",
+    )
@@ -0,0 +1,10 @@
+from django.urls import include, path
+from superlists import views as superlists_views
+from lists import async_views
+
+urlpatterns = [
+    path("", async_views.home_page, name="home"),
+    path("lists/", include("lists.async_urls")),
+    path("accounts/", include("accounts.urls")),
+    path("metrics/views", superlists_views.metrics_report, name="metrics_report"),
+]
@@ -0,0 +1,20 @@
+import jinja2
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils.html import conditional_escape
+
+
+def url(viewname, *args):
+    return reverse(viewname, args=args)
+
+
+def environment(**options):
+    # The Jinja2 templates must render byte-for-byte what the Django ones do:
+    # Django's escaping (markupsafe writes quotes differently), empty output
+    # for missing variables, and the file's trailing newline.
+    options["undefined"] = jinja2.Undefined
+    env = jinja2.Environment(
+        finalize=conditional_escape, keep_trailing_newline=True, **options
+    )
+    env.globals.update(url=url, static=static)
+    return env
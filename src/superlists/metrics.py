@@ -0,0 +1,82 @@
+import bisect
+import threading
+from collections import defaultdict
+
+MS_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0
+        self.sum = 0
+        self.max = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, fraction):
+        # Upper bound of the bucket holding the quantile; the overflow bucket
+        # reports the largest value seen.
+        rank = fraction * self.total
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if count and seen >= rank:
+                return bound
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.total,
+            "mean": round(self.sum / self.total, 3) if self.total else None,
+            "max": round(self.max, 3),
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip([*map(str, self.bounds), "+Inf"], self.counts)),
+        }
+
+
+class ViewMetrics:
+    FIELDS = {
+        "queries": COUNT_BUCKETS,
+        "db_ms": MS_BUCKETS,
+        "template_ms": MS_BUCKETS,
+        "total_ms": MS_BUCKETS,
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = defaultdict(self._new_view)
+
+    def _new_view(self):
+        return {field: Histogram(bounds) for field, bounds in self.FIELDS.items()}
+
+    def record(self, view_name, **values):
+        with self._lock:
+            histograms = self._views[view_name]
+            for field, value in values.items():
+                histograms[field].observe(value)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                view_name: {
+                    field: histogram.snapshot()
+                    for field, histogram in histograms.items()
+                }
+                for view_name, histograms in sorted(self._views.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+view_metrics = ViewMetrics()
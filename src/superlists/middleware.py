@@ -0,0 +1,73 @@
+import threading
+import time
+
+from django.db import connections
+from django.template.backends import django as django_backend
+from django.template.backends import jinja2 as jinja2_backend
+
+from superlists.metrics import view_metrics
+
+_state = threading.local()
+# Timed at the backend, which render() and render_to_string() go through
+# whichever engine resolves the template.
+_template_classes = (django_backend.Template, jinja2_backend.Template)
+_original_template_renders = {cls: cls.render for cls in _template_classes}
+
+
+def _timed_template_render(original_render):
+    def render(self, context=None, request=None):
+        # Only time the outermost render, in case one template renders
+        # another.
+        if getattr(_state, "recording", False) and _state.render_depth == 0:
+            _state.render_depth += 1
+            start = time.perf_counter()
+            try:
+                return original_render(self, context, request)
+            finally:
+                _state.template_time += time.perf_counter() - start
+                _state.render_depth -= 1
+        return original_render(self, context, request)
+
+    return render
+
+
+def _count_queries(execute, sql, params, many, context):
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        _state.db_time += time.perf_counter() - start
+        _state.queries += 1
+
+
+class ViewMetricsMiddleware:
+    # Only installed when DJANGO_VIEW_METRICS is set, so a disabled deployment
+    # pays nothing: no wrapper, no patched template backends.
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        for cls, original_render in _original_template_renders.items():
+            cls.render = _timed_template_render(original_render)
+
+    def __call__(self, request):
+        _state.recording = True
+        _state.render_depth = 0
+        _state.queries = 0
+        _state.db_time = 0.0
+        _state.template_time = 0.0
+        start = time.perf_counter()
+        try:
+            with connections["default"].execute_wrapper(_count_queries):
+                response = self.get_response(request)
+        finally:
+            _state.recording = False
+        total = time.perf_counter() - start
+        match = getattr(request, "resolver_match", None)
+        view_metrics.record(
+            match.url_name if match and match.url_name else "<unresolved>",
+            queries=_state.queries,
+            db_ms=_state.db_time * 1000,
+            template_ms=_state.template_time * 1000,
+            total_ms=total * 1000,
+        )
+        return response
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 import os
+from datetime import timedelta
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,12 +44,21 @@ INSTALLED_APPS = [
     'lists',
     'accounts',
     "functional_tests",
+    "benchmarks",
 ]
 
 AUTH_USER_MODEL = "accounts.User"
 AUTHENTICATION_BACKENDS = [
     "accounts.authentication.PasswordlessAuthenticationBackend",
 ]
+# Users resolved by get_user() on every authenticated request are kept in a
+# per-process LRU, optionally backed by a shared Django cache alias.
+AUTH_USER_CACHE_SIZE = int(os.environ.get("DJANGO_AUTH_USER_CACHE_SIZE", 1024))
+AUTH_USER_CACHE_TTL = int(os.environ.get("DJANGO_AUTH_USER_CACHE_TTL", 60))
+AUTH_USER_CACHE_ALIAS = os.environ.get("DJANGO_AUTH_USER_CACHE_ALIAS")
+LOGIN_TOKEN_TTL = timedelta(
+    seconds=int(os.environ.get("DJANGO_LOGIN_TOKEN_TTL_SECONDS", 60 * 60))
+)
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
@@ -61,37 +71,157 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-ROOT_URLCONF = 'superlists.urls'
+# Per-view query counts, DB time, template time and latency, readable at
+# /metrics/views with an "Authorization: Bearer <token>" header.
+VIEW_METRICS = "DJANGO_VIEW_METRICS" in os.environ
+VIEW_METRICS_TOKEN = os.environ.get("DJANGO_VIEW_METRICS_TOKEN")
+if VIEW_METRICS:
+    MIDDLEWARE.insert(0, "superlists.middleware.ViewMetricsMiddleware")
 
-TEMPLATES = [
-    {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
-        'APP_DIRS': True,
-        'OPTIONS': {
-            'context_processors': [
-                'django.template.context_processors.debug',
-                'django.template.context_processors.request',
-                'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
-            ],
-        },
-    },
+if "DJANGO_ASYNC_VIEWS" in os.environ:
+    ROOT_URLCONF = "superlists.async_urls"
+else:
+    ROOT_URLCONF = 'superlists.urls'
+
+TEMPLATE_CONTEXT_PROCESSORS = [
+    'django.template.context_processors.debug',
+    'django.template.context_processors.request',
+    'django.contrib.auth.context_processors.auth',
+    'django.contrib.messages.context_processors.messages',
 ]
 
+# Parsed templates are kept by the cached loader; runserver's autoreloader
+# clears it when a template changes. DJANGO_TEMPLATE_ENGINE=jinja2 puts the
+# Jinja2 ports of the hot templates (each app's jinja2/ directory) first;
+# anything without a port still renders through the Django engine.
+DJANGO_TEMPLATES = {
+    'BACKEND': 'django.template.backends.django.DjangoTemplates',
+    'DIRS': [],
+    'OPTIONS': {
+        'context_processors': TEMPLATE_CONTEXT_PROCESSORS,
+        "loaders": [
+            (
+                "django.template.loaders.cached.Loader",
+                ["django.template.loaders.app_directories.Loader"],
+            ),
+        ],
+    },
+}
+JINJA2_TEMPLATES = {
+    "BACKEND": "django.template.backends.jinja2.Jinja2",
+    "DIRS": [],
+    "APP_DIRS": True,
+    "OPTIONS": {
+        "environment": "superlists.jinja2.environment",
+        "context_processors": TEMPLATE_CONTEXT_PROCESSORS,
+    },
+}
+if os.environ.get("DJANGO_TEMPLATE_ENGINE") == "jinja2":
+    TEMPLATES = [JINJA2_TEMPLATES, DJANGO_TEMPLATES]
+else:
+    TEMPLATES = [DJANGO_TEMPLATES, JINJA2_TEMPLATES]
+
 WSGI_APPLICATION = 'superlists.wsgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+# Every new SQLite connection runs these pragmas. WAL lets readers carry on
+# while a worker writes, and IMMEDIATE transactions take the write lock up
+# front so concurrent writers wait on busy_timeout instead of failing with
+# "database is locked" when a read lock can't be upgraded. Set any of the
+# variables to an empty string to fall back to SQLite's default.
+
+SQLITE_PRAGMAS = {
+    "journal_mode": os.environ.get("DJANGO_SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.environ.get("DJANGO_SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": os.environ.get("DJANGO_SQLITE_BUSY_TIMEOUT_MS", "5000"),
+    "mmap_size": os.environ.get("DJANGO_SQLITE_MMAP_SIZE", str(128 * 1024 * 1024)),
+    # Negative values are KiB rather than pages.
+    "cache_size": os.environ.get("DJANGO_SQLITE_CACHE_SIZE", "-20000"),
+    "temp_store": os.environ.get("DJANGO_SQLITE_TEMP_STORE", "MEMORY"),
+}
 
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get("DJANGO_DB_PATH", BASE_DIR / 'db.sqlite3'),
+        "OPTIONS": {
+            "init_command": ";".join(
+                f"PRAGMA {pragma}={value}"
+                for pragma, value in SQLITE_PRAGMAS.items()
+                if value
+            ),
+            "transaction_mode": (
+                os.environ.get("DJANGO_SQLITE_TRANSACTION_MODE", "IMMEDIATE") or None
+            ),
+        },
+    }
+}
+
+# Workers keep their connection between requests (and so only pay for the
+# pragmas above once) when DJANGO_DB_CONN_MAX_AGE is set; "none" never closes
+# it. Health checks catch connections that went bad while idle.
+if "DJANGO_DB_CONN_MAX_AGE" in os.environ:
+    conn_max_age = os.environ["DJANGO_DB_CONN_MAX_AGE"]
+    DATABASES["default"]["CONN_MAX_AGE"] = (
+        None if conn_max_age.lower() == "none" else int(conn_max_age)
+    )
+if "DJANGO_DB_CONN_HEALTH_CHECKS" in os.environ:
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+
+# Caches
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# The locmem cache is per process, so deployments running several workers
+# should point DJANGO_FRAGMENT_CACHE_DIR at a directory they all share.
+
+FRAGMENT_CACHE_OPTIONS = {
+    "MAX_ENTRIES": int(os.environ.get("DJANGO_FRAGMENT_CACHE_MAX_ENTRIES", 1000)),
+}
+if "DJANGO_FRAGMENT_CACHE_DIR" in os.environ:
+    FRAGMENT_CACHE = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ["DJANGO_FRAGMENT_CACHE_DIR"],
+        "OPTIONS": FRAGMENT_CACHE_OPTIONS,
+    }
+else:
+    FRAGMENT_CACHE = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "list-fragments",
+        "OPTIONS": FRAGMENT_CACHE_OPTIONS,
     }
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "fragments": FRAGMENT_CACHE,
+    "sessions": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "sessions",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
 }
 
+LIST_FRAGMENT_CACHE = "fragments"
+
+
+# Sessions
+# https://docs.djangoproject.com/en/5.1/topics/http/sessions/
+# "db" reads django_session on every request with a session cookie.
+# "cached_db" serves repeat reads from the "sessions" cache and
+# "signed_cookies" keeps the (tiny) passwordless session in the cookie itself,
+# so neither touches the session table on reads.
+
+SESSION_ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+SESSION_ENGINE = SESSION_ENGINES[os.environ.get("DJANGO_SESSION_MODE", "db")]
+SESSION_CACHE_ALIAS = "sessions"
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -129,6 +259,21 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / "static"
+# In production collectstatic writes content-hashed copies of every asset
+# plus gzip and brotli variants, and WhiteNoise serves the hashed names with
+# far-future immutable caching. Development keeps the plain storage so
+# runserver and the tests work without running collectstatic first.
+STATIC_MANIFEST_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": (
+            "django.contrib.staticfiles.storage.StaticFilesStorage"
+            if DEBUG
+            else STATIC_MANIFEST_STORAGE
+        ),
+    },
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -151,3 +296,11 @@ EMAIL_HOST_USER = "katie.bickford@thedatalab.org"
 EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_PASSWORD")
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
+
+# Login emails are queued in the accounts.OutboundEmail table and sent in
+# batches, either by 'manage.py send_queued_email' or, with
+# DJANGO_EMAIL_OUTBOX_THREAD set, by a background thread in each web worker.
+EMAIL_OUTBOX_THREAD = "DJANGO_EMAIL_OUTBOX_THREAD" in os.environ
+EMAIL_OUTBOX_BATCH_SIZE = int(os.environ.get("DJANGO_EMAIL_OUTBOX_BATCH_SIZE", 100))
+EMAIL_OUTBOX_POLL_SECONDS = float(os.environ.get("DJANGO_EMAIL_OUTBOX_POLL_SECONDS", 5))
+EMAIL_OUTBOX_LEASE = timedelta(minutes=5)
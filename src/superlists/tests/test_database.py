@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase
+
+
+class SQLitePragmasTest(TestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return str(cursor.fetchone()[0])
+
+    def test_connections_apply_configured_pragmas(self):
+        pragmas = settings.SQLITE_PRAGMAS
+        self.assertEqual(self.pragma("busy_timeout"), pragmas["busy_timeout"])
+        self.assertEqual(self.pragma("cache_size"), pragmas["cache_size"])
+        # 1 is NORMAL, 2 is MEMORY.
+        self.assertEqual(self.pragma("synchronous"), "1")
+        self.assertEqual(self.pragma("temp_store"), "2")
+
+    def test_transactions_take_the_write_lock_up_front(self):
+        self.assertEqual(connection.transaction_mode, "IMMEDIATE")
@@ -0,0 +1,79 @@
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from lists.models import Item, List
+from superlists.metrics import Histogram, view_metrics
+
+
+class HistogramTest(SimpleTestCase):
+    def test_quantiles_report_bucket_upper_bounds(self):
+        histogram = Histogram((1, 5, 10))
+        for value in (0.5, 0.7, 3, 4, 7, 20):
+            histogram.observe(value)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["count"], 6)
+        self.assertEqual(snapshot["p50"], 5)
+        self.assertEqual(snapshot["p99"], 20)
+        self.assertEqual(snapshot["buckets"], {"1": 2, "5": 2, "10": 1, "+Inf": 1})
+
+
+@override_settings(
+    MIDDLEWARE=["superlists.middleware.ViewMetricsMiddleware", *settings.MIDDLEWARE],
+    VIEW_METRICS=True,
+    VIEW_METRICS_TOKEN="sekrit",
+)
+class ViewMetricsMiddlewareTest(TestCase):
+    def setUp(self):
+        view_metrics.reset()
+
+    def get_report(self):
+        response = self.client.get(
+            "/metrics/views", headers={"authorization": "Bearer sekrit"}
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_records_metrics_per_url_name(self):
+        mylist = List.objects.create()
+        Item.objects.create(list=mylist, text="itemey")
+        self.client.get(f"/lists/{mylist.id}/")
+        self.client.get(f"/lists/{mylist.id}/")
+        self.client.get("/")
+
+        views = self.get_report()["views"]
+
+        self.assertEqual(views["view_list"]["total_ms"]["count"], 2)
+        self.assertEqual(views["home"]["queries"]["max"], 0)
+        self.assertGreater(views["view_list"]["queries"]["max"], 0)
+        self.assertGreater(views["view_list"]["template_ms"]["max"], 0)
+        self.assertGreater(views["view_list"]["db_ms"]["max"], 0)
+
+    def test_times_templates_rendered_by_jinja2(self):
+        mylist = List.objects.create()
+        Item.objects.create(list=mylist, text="itemey")
+        with override_settings(
+            TEMPLATES=[settings.JINJA2_TEMPLATES, settings.DJANGO_TEMPLATES]
+        ):
+            self.client.get(f"/lists/{mylist.id}/")
+
+        views = self.get_report()["views"]
+
+        self.assertGreater(views["view_list"]["template_ms"]["max"], 0)
+
+    def test_report_requires_token(self):
+        response = self.client.get(
+            "/metrics/views", headers={"authorization": "Bearer wrong"}
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_report_includes_auth_user_cache_stats(self):
+        self.assertIn("hits", self.get_report()["auth_user_cache"])
+
+
+class MetricsDisabledTest(TestCase):
+    def test_report_is_404_when_metrics_are_off(self):
+        response = self.client.get("/metrics/views")
+        self.assertEqual(response.status_code, 404)
+
+    def test_middleware_is_not_installed_by_default(self):
+        self.assertNotIn("superlists.middleware.ViewMetricsMiddleware", settings.MIDDLEWARE)
@@ -0,0 +1,72 @@
+import re
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+
+class StaticAssetsTest(TestCase):
+    # Collects into a scratch STATIC_ROOT with the production storage, then
+    # serves through WhiteNoise exactly as gunicorn would.
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.static_root)
+        production_static = override_settings(
+            STATIC_ROOT=cls.static_root,
+            STORAGES={
+                **settings.STORAGES,
+                "staticfiles": {"BACKEND": settings.STATIC_MANIFEST_STORAGE},
+            },
+        )
+        production_static.enable()
+        cls.addClassCleanup(production_static.disable)
+        # Brotli at full strength is slow, so only collect what pages use.
+        call_command(
+            "collectstatic",
+            interactive=False,
+            verbosity=0,
+            ignore_patterns=[
+                "admin",
+                "tests",
+                "js",
+                "bootstrap-*",
+                "*.rtl.*",
+                "bootstrap.css*",
+            ],
+        )
+
+    def asset_urls(self):
+        html = self.client.get("/").content.decode()
+        return re.findall(r'(?:href|src)="(/static/[^"]+)"', html)
+
+    def test_pages_link_to_content_hashed_assets(self):
+        urls = self.asset_urls()
+        self.assertEqual(len(urls), 2)
+        for url in urls:
+            self.assertRegex(url, r"\.[0-9a-f]{12}\.(css|js)$")
+
+    def test_hashed_assets_are_cached_forever(self):
+        for url in self.asset_urls():
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("immutable", response["Cache-Control"])
+            self.assertIn("max-age=315360000", response["Cache-Control"])
+
+    def test_repeat_page_loads_fetch_zero_static_bytes(self):
+        for url in self.asset_urls():
+            first = self.client.get(url)
+            self.assertGreater(len(b"".join(first.streaming_content)), 0)
+            repeat = self.client.get(url, headers={"If-None-Match": first["ETag"]})
+            self.assertEqual(repeat.status_code, 304)
+            self.assertEqual(b"".join(repeat.streaming_content), b"")
+
+    def test_serves_precompressed_variants(self):
+        for url in self.asset_urls():
+            for encoding in ("br", "gzip"):
+                response = self.client.get(url, headers={"Accept-Encoding": encoding})
+                self.assertEqual(response["Content-Encoding"], encoding)
@@ -0,0 +1,99 @@
+import re
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.template import engines
+from django.test import TestCase, override_settings
+
+from lists.fragments import fragment_cache
+from lists.models import Item, List
+from lists.views import ITEMS_PER_PAGE
+
+User = get_user_model()
+
+CSRF_TOKEN = re.compile(r'name="csrfmiddlewaretoken" value="[^"]+"')
+
+
+class JinjaTemplatesTest(TestCase):
+    # The Jinja2 ports must be drop-in replacements, so render each page with
+    # the Django engine and then with Jinja2 first and compare the HTML.
+
+    def render_with_each_engine(self, method, url, **kwargs):
+        pages = []
+        for templates in (
+            [settings.DJANGO_TEMPLATES, settings.JINJA2_TEMPLATES],
+            [settings.JINJA2_TEMPLATES, settings.DJANGO_TEMPLATES],
+        ):
+            fragment_cache().clear()
+            with override_settings(TEMPLATES=templates):
+                response = getattr(self.client, method)(url, **kwargs)
+            self.assertEqual(response.status_code, 200)
+            # Each render masks the CSRF token differently.
+            pages.append(CSRF_TOKEN.sub("", response.content.decode()))
+        return pages
+
+    def assertSameHTML(self, method, url, **kwargs):
+        django_page, jinja_page = self.render_with_each_engine(method, url, **kwargs)
+        self.assertEqual(jinja_page, django_page)
+        return django_page
+
+    def test_hot_templates_resolve_to_jinja2_when_it_comes_first(self):
+        with override_settings(
+            TEMPLATES=[settings.JINJA2_TEMPLATES, settings.DJANGO_TEMPLATES]
+        ):
+            for name in ("base.html", "list.html", "my_lists.html"):
+                template = engines["jinja2"].get_template(name)
+                self.assertIn("lists/jinja2", template.origin.name)
+
+    def test_django_engine_caches_parsed_templates(self):
+        loader = engines["django"].engine.template_loaders[0]
+        self.assertEqual(loader.__module__, "django.template.loaders.cached")
+
+    def test_list_page_for_anonymous_user(self):
+        our_list = List.objects.create()
+        Item.objects.create(list=our_list, text="<b>escaped</b> & 'quoted'")
+        page = self.assertSameHTML("get", our_list.get_absolute_url())
+        self.assertIn("&lt;b&gt;escaped&lt;/b&gt; &amp; &#x27;quoted&#x27;", page)
+
+    def test_paginated_list_page_for_logged_in_owner(self):
+        owner = User.objects.create(email="a@b.com")
+        sharee = User.objects.create(email="friend@b.com")
+        our_list = List.objects.create(owner=owner)
+        our_list.shared_with.add(sharee)
+        Item.objects.bulk_create(
+            Item(list=our_list, text=f"item {n}") for n in range(ITEMS_PER_PAGE + 5)
+        )
+        after = Item.objects.order_by("id")[ITEMS_PER_PAGE - 1].id
+        self.client.force_login(owner)
+        self.assertSameHTML("get", our_list.get_absolute_url())
+        page = self.assertSameHTML(
+            "get", f"{our_list.get_absolute_url()}?after={after}&start={ITEMS_PER_PAGE}"
+        )
+        self.assertIn(f"{ITEMS_PER_PAGE + 1}: item {ITEMS_PER_PAGE}", page)
+
+    def test_list_page_with_form_errors(self):
+        our_list = List.objects.create()
+        Item.objects.create(list=our_list, text="dupe")
+        page = self.assertSameHTML(
+            "post", our_list.get_absolute_url(), data={"text": "dupe"}
+        )
+        self.assertIn("is-invalid", page)
+
+    def test_list_page_with_messages(self):
+        owner = User.objects.create(email="a@b.com")
+        our_list = List.objects.create(owner=owner)
+        self.client.force_login(owner)
+        page = self.assertSameHTML(
+            "post",
+            f"/lists/{our_list.id}/share",
+            data={"sharee": "nobody@b.com"},
+            follow=True,
+        )
+        self.assertIn("alert-warning", page)
+
+    def test_my_lists_page(self):
+        owner = User.objects.create(email="a@b.com")
+        List.objects.create_with_item("mine", owner=owner)
+        List.objects.create_with_item("theirs").shared_with.add(owner)
+        self.client.force_login(owner)
+        self.assertSameHTML("get", "/lists/users/a@b.com/")
@@ -16,9 +16,11 @@ Including another URLconf
 """
 from django.urls import include, path
 from lists import views as list_views
+from superlists import views as superlists_views
 
 urlpatterns = [
     path("", list_views.home_page, name="home"),
     path("lists/", include("lists.urls")),
     path("accounts/", include("accounts.urls")),
+    path("metrics/views", superlists_views.metrics_report, name="metrics_report"),
 ]
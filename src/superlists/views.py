@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.http import Http404, HttpResponseForbidden, JsonResponse
+from django.utils.crypto import constant_time_compare
+
+from accounts.user_cache import get_user_cache
+from superlists.metrics import view_metrics
+
+
+def metrics_report(request):
+    if not (settings.VIEW_METRICS and settings.VIEW_METRICS_TOKEN):
+        raise Http404("View metrics are disabled")
+    expected = f"Bearer {settings.VIEW_METRICS_TOKEN}"
+    if not constant_time_compare(request.headers.get("Authorization", ""), expected):
+        return HttpResponseForbidden()
+    return JsonResponse(
+        {
+            "views": view_metrics.snapshot(),
+            "auth_user_cache": get_user_cache().stats(),
+        }
+    )